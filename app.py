@@ -5,14 +5,25 @@ Endpoints:
 - POST /upload - Upload document and translate
 - POST /translate - Translate plain text
 - GET /languages - Get supported languages
+- POST /analyze - Analyze document with AI (queued when REDIS_URL is set)
+- GET /jobs/<id> - Poll a queued analysis
 - GET /health - Health check
 """
 
 import os
+import re
 import sys
+import json
+import time
+import hashlib
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import orjson
 from flask import Flask, request, jsonify, render_template, send_file
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
+from flask_compress import Compress
 from werkzeug.utils import secure_filename
 from dotenv import load_dotenv
 
@@ -24,22 +35,160 @@ if sys.platform == "win32":
 load_dotenv()
 
 # Import our modules
-from translator import translate_text, translate_long_text, get_supported_languages
-from openai_client import generate_ai_response, summarize_text
-from document_processor import extract_text, translate_document_file
+from translator import translate_text, translate_texts, translate_long_text, get_supported_languages, MAX_CONCURRENT_REQUESTS
+from openai_client import summarize_text
+from document_processor import extract_text, extract_text_in_pool, translate_document_file
+from jobs import analyze_document_bytes, enqueue_analysis, get_job_status
+
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson (native encoder, emits bytes directly)."""
+    
+    option = orjson.OPT_NON_STR_KEYS
+    compact = True  # set False for indented (debug) output
+    
+    def _option(self):
+        return self.option if self.compact else self.option | orjson.OPT_INDENT_2
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=self._option()).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj, option=self._option()), mimetype="application/json")
+
 
 # Initialize Flask app
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
+app.json.compact = True  # no pretty-printing, fewer bytes per response
 CORS(app)  # Enable CORS for frontend
 
 # Configuration
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
 app.config['UPLOAD_FOLDER'] = tempfile.gettempdir()
-ALLOWED_EXTENSIONS = {'pdf', 'docx', 'txt'}
+
+# Compress JSON/HTML responses over 1 KB (translated text is highly redundant UTF-8)
+app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+app.config['COMPRESS_MIN_SIZE'] = 1024
+app.config['COMPRESS_LEVEL'] = 5
+Compress(app)
+ALLOWED_EXTENSIONS = frozenset({'pdf', 'docx', 'txt'})
+_EXT_RE = re.compile(r'\.(?:pdf|docx|txt)\Z', re.IGNORECASE)
+
+# Summarization: long documents are summarized in chunks, concurrently, and the
+# partial summaries reduced to one (see openai_client.summarize_text). Text past
+# this many characters is not read, which bounds the OpenAI calls per upload.
+SUMMARY_MAX_CHARS = 200000
+
+# Sentence boundary in a streamed summary; the captured whitespace is kept
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?])(\s+)')
+_PARAGRAPH_SPLIT_RE = re.compile(r'(\n\s*\n)')
+
+# Streamed summaries are translated in batches of whole sentences of about this size
+SUMMARY_TRANSLATE_CHARS = 1000
+
+# The Translator language list changes every few weeks; cache it for a day
+LANGUAGES_CACHE_SECONDS = 24 * 60 * 60
 
 def allowed_file(filename):
     """Check if file extension is allowed."""
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+    return _EXT_RE.search(filename) is not None
+
+@lru_cache(maxsize=32)
+def _error_body(message):
+    """Serialized {"success": false, "error": message} body, built once per message."""
+    return orjson.dumps({"success": False, "error": message})
+
+def _json_error(message, status):
+    """
+    JSON error response for a fixed message. Only the body bytes are cached:
+    CORS and Compress mutate the Response on the way out, so it is built per call.
+    """
+    return app.response_class(_error_body(message), status=status, mimetype="application/json")
+
+def _preview(text, limit):
+    """Return text cut to limit characters, with "..." appended when cut."""
+    return text if len(text) <= limit else text[:limit] + "..."
+
+def _translate_paragraphs(text, source_lang, target_lang):
+    """
+    Translate text paragraph by paragraph in one translate_texts call,
+    keeping the blank lines between paragraphs as they are.
+    """
+    # parts = [paragraph, separator, paragraph, ..., paragraph]
+    parts = _PARAGRAPH_SPLIT_RE.split(text)
+    paragraphs = [i for i in range(0, len(parts), 2) if parts[i].strip()]
+    
+    for i, result in zip(paragraphs, translate_texts([parts[i] for i in paragraphs], source_lang, target_lang)):
+        if not result["success"]:
+            return result
+        parts[i] = result["translated_text"]
+    
+    return {"success": True, "translated_text": "".join(parts)}
+
+def _stream_summary_translation(text, source_lang, target_lang):
+    """
+    Summarize a document and translate the summary in batches of whole
+    sentences (about SUMMARY_TRANSLATE_CHARS each) as the final completion
+    streams in, so translation overlaps generation. Long documents are
+    summarized chunk-wise and reduced to one summary by summarize_text. Sentences of a batch are
+    translated together, so they keep their context.
+    """
+    batches = []  # (translation future, or None for untranslated whitespace, following text)
+    buffer = ""   # streamed text after the last complete sentence
+    batch = ""    # complete sentences not yet sent for translation
+    
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as pool:
+        def flush(separator):
+            nonlocal batch
+            if batch.strip():
+                batches.append((pool.submit(_translate_paragraphs, batch, source_lang, target_lang), separator))
+            else:
+                batches.append((None, batch + separator))
+            batch = ""
+        
+        def on_token(delta):
+            nonlocal buffer, batch
+            buffer += delta
+            # parts = [sentence, separator, sentence, separator, ..., incomplete tail]
+            parts = _SENTENCE_SPLIT_RE.split(buffer)
+            for i in range(0, len(parts) - 1, 2):
+                batch += parts[i]
+                if len(batch) >= SUMMARY_TRANSLATE_CHARS:
+                    flush(parts[i + 1])
+                else:
+                    batch += parts[i + 1]
+            buffer = parts[-1]
+        
+        # Not stream=True: this path keeps the response cache and usage counts
+        summary = summarize_text(text, style="concise", on_token=on_token)
+        
+        if not summary["success"]:
+            return {"success": False, "error": f"Summarization failed: {summary['error']}"}
+        
+        batch += buffer
+        flush("")
+        
+        translated_parts = []
+        for future, following in batches:
+            if future is None:
+                translated_parts.append(following)
+                continue
+            result = future.result()
+            if not result["success"]:
+                return {"success": False, "error": result["error"]}
+            translated_parts.append(result["translated_text"] + following)
+    
+    return {
+        "success": True,
+        "summary": summary["response"],
+        "translated_text": "".join(translated_parts),
+        "chunks_translated": sum(1 for future, _ in batches if future is not None),
+        "tokens_used": summary["usage"]["total_tokens"]
+    }
 
 @app.route('/')
 def index():
@@ -55,27 +204,44 @@ def health_check():
         "version": "1.0.0"
     })
 
+@lru_cache(maxsize=4)
+def _cached_languages(day_bucket: int) -> tuple:
+    """
+    Fetch the simplified {code: name} language list once per day bucket.
+    
+    Returns (languages, etag). Failures raise so they are never cached.
+    """
+    result = get_supported_languages()
+    
+    if not result["success"]:
+        raise RuntimeError(result["error"])
+    
+    languages = {code: info.get("name", code) for code, info in result["languages"].items()}
+    etag = hashlib.blake2b(json.dumps(languages, sort_keys=True).encode('utf-8'), digest_size=16).hexdigest()
+    return languages, etag
+
 @app.route('/languages', methods=['GET'])
 def list_languages():
     """Get list of supported languages for translation."""
-    result = get_supported_languages()
-    
-    if result["success"]:
-        # Return simplified language list
-        languages = {}
-        for code, info in result["languages"].items():
-            languages[code] = info.get("name", code)
-        
-        return jsonify({
-            "success": True,
-            "languages": languages,
-            "count": len(languages)
-        })
-    else:
+    try:
+        languages, etag = _cached_languages(int(time.time() // LANGUAGES_CACHE_SECONDS))
+    except RuntimeError as e:
         return jsonify({
             "success": False,
-            "error": result["error"]
+            "error": str(e)
         }), 500
+    
+    response = jsonify({
+        "success": True,
+        "languages": languages,
+        "count": len(languages)
+    })
+    
+    # Let browsers/CDNs cache the list and revalidate with If-None-Match (304)
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = LANGUAGES_CACHE_SECONDS
+    return response.make_conditional(request)
 
 @app.route('/translate', methods=['POST'])
 def translate_endpoint():
@@ -85,7 +251,7 @@ def translate_endpoint():
     data = request.get_json()
     
     if not data:
-        return jsonify({"success": False, "error": "No JSON data provided"}), 400
+        return _json_error("No JSON data provided", 400)
     
     text = data.get('text')
     source_lang = data.get('source_lang', 'en')
@@ -93,10 +259,10 @@ def translate_endpoint():
     should_summarize = data.get('summarize', False)
     
     if not text:
-        return jsonify({"success": False, "error": "No text provided"}), 400
+        return _json_error("No text provided", 400)
     
     if not target_lang:
-        return jsonify({"success": False, "error": "No target_lang provided"}), 400
+        return _json_error("No target_lang provided", 400)
     
     response_data = {
         "original_text": text,
@@ -159,14 +325,14 @@ def upload_and_preserve():
     print("DEBUG: /upload-document endpoint called", file=sys.stderr)
     
     if 'file' not in request.files:
-        return jsonify({"success": False, "error": "No file provided"}), 400
+        return _json_error("No file provided", 400)
     
     file = request.files['file']
     if file.filename == '':
-        return jsonify({"success": False, "error": "No file selected"}), 400
+        return _json_error("No file selected", 400)
         
     if not allowed_file(file.filename):
-        return jsonify({"success": False, "error": "File type not allowed"}), 400
+        return _json_error("File type not allowed", 400)
 
     target_lang = request.form.get('target_lang', 'nl')
     source_lang = request.form.get('source_lang', 'auto')  # Auto-detect by default
@@ -174,28 +340,26 @@ def upload_and_preserve():
     print(f"DEBUG: File: {file.filename}, Source: {source_lang}, Target: {target_lang}", file=sys.stderr)
     
     filename = secure_filename(file.filename)
+    file_type = file.filename.rsplit('.', 1)[1].lower()
     import uuid
     unique_id = str(uuid.uuid4())[:8]
-    temp_input = os.path.join(app.config['UPLOAD_FOLDER'], f"in_{unique_id}_{filename}")
     output_filename = f"translated_{unique_id}_{os.path.splitext(filename)[0]}.docx"
     temp_output = os.path.join(app.config['UPLOAD_FOLDER'], output_filename)
     
     try:
-        file.save(temp_input)
-        print(f"DEBUG: Saved input file to: {temp_input}", file=sys.stderr)
-        
-        # Translate
+        # Translate straight from the in-memory upload; only the output is written to disk
+        file_bytes = file.stream.read()
         print(f"DEBUG: Starting translation...", file=sys.stderr)
-        result = translate_document_file(temp_input, temp_output, source_lang, target_lang)
+        result = translate_document_file(file_bytes, temp_output, source_lang, target_lang, file_type=file_type)
         print(f"DEBUG: Translation result: success={result.get('success')}, translated_count={result.get('translated_count', 'N/A')}", file=sys.stderr)
         
         if result["success"]:
             # Extract preview text from the output DOCX
             preview_text = "Preview not available."
             try:
-                extraction = extract_text(result["output_path"])
+                extraction = extract_text(result["output_path"], max_chars=1000)
                 if extraction["success"]:
-                    preview_text = extraction["text"][:1000] + "..." if len(extraction["text"]) > 1000 else extraction["text"]
+                    preview_text = extraction["text"] + "..." if extraction.get("truncated") else extraction["text"]
             except:
                 pass
 
@@ -214,10 +378,6 @@ def upload_and_preserve():
     except Exception as e:
         print(f"DEBUG: Exception: {str(e)}", file=sys.stderr)
         return jsonify({"success": False, "error": str(e)}), 500
-        
-    finally:
-        if os.path.exists(temp_input):
-            os.remove(temp_input)
 
 @app.route('/upload', methods=['POST'])
 def upload_and_translate():
@@ -236,100 +396,78 @@ def upload_and_translate():
     """
     # Check if file is present
     if 'file' not in request.files:
-        return jsonify({"success": False, "error": "No file provided"}), 400
+        return _json_error("No file provided", 400)
     
     file = request.files['file']
     
     if file.filename == '':
-        return jsonify({"success": False, "error": "No file selected"}), 400
+        return _json_error("No file selected", 400)
     
     if not allowed_file(file.filename):
-        return jsonify({
-            "success": False,
-            "error": f"File type not allowed. Supported: {', '.join(ALLOWED_EXTENSIONS)}"
-        }), 400
+        return _json_error(f"File type not allowed. Supported: {', '.join(ALLOWED_EXTENSIONS)}", 400)
     
     # Get parameters
     target_lang = request.form.get('target_lang', 'hi')
     source_lang = request.form.get('source_lang', 'auto')  # Auto-detect by default
     should_summarize = request.form.get('summarize', 'false').lower() == 'true'
     
-    # Save file temporarily
+    # Read the upload into memory; no temp file round-trip
     filename = secure_filename(file.filename)
-    temp_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+    file_type = file.filename.rsplit('.', 1)[1].lower()
+    file_bytes = file.stream.read()
     
-    try:
-        file.save(temp_path)
-        
-        # Extract text from document
-        extraction_result = extract_text(temp_path)
-        
-        if not extraction_result["success"]:
-            return jsonify({
-                "success": False,
-                "error": extraction_result["error"]
-            }), 500
-        
-        extracted_text = extraction_result["text"]
-        
-        if not extracted_text or not extracted_text.strip():
-            return jsonify({
-                "success": False,
-                "error": "No text content found in document"
-            }), 400
-        
-        response_data = {
-            "filename": filename,
-            "file_type": extraction_result.get("file_type"),
-            "extracted_text_length": len(extracted_text),
-            "source_lang": source_lang,
-            "target_lang": target_lang
-        }
-        
-        text_to_translate = extracted_text
-        
-        # Optional: Summarize first
-        if should_summarize:
-            # For long documents, chunk the text
-            max_chars = 4000  # Keep under token limits
-            if len(extracted_text) > max_chars:
-                text_to_summarize = extracted_text[:max_chars]
-                response_data["text_truncated"] = True
-            else:
-                text_to_summarize = extracted_text
-            
-            summary_result = summarize_text(text_to_summarize, style="concise")
-            if summary_result["success"]:
-                text_to_translate = summary_result["response"]
-                response_data["summary"] = text_to_translate
-                response_data["tokens_used"] = summary_result["usage"]["total_tokens"]
-            else:
-                return jsonify({
-                    "success": False,
-                    "error": f"Summarization failed: {summary_result['error']}"
-                }), 500
-        
+    # Extract text from document; summaries read at most SUMMARY_MAX_CHARS
+    max_chars = SUMMARY_MAX_CHARS if should_summarize else None
+    extraction_result = extract_text_in_pool(file_bytes, file_type, max_chars=max_chars)
+    
+    if not extraction_result["success"]:
+        return jsonify({
+            "success": False,
+            "error": extraction_result["error"]
+        }), 500
+    
+    extracted_text = extraction_result["text"]
+    
+    if not extracted_text or extracted_text.isspace():
+        return _json_error("No text content found in document", 400)
+    
+    response_data = {
+        "filename": filename,
+        "file_type": extraction_result.get("file_type"),
+        "extracted_text_length": len(extracted_text),
+        "source_lang": source_lang,
+        "target_lang": target_lang
+    }
+    
+    if extraction_result.get("truncated"):
+        response_data["text_truncated"] = True
+    
+    text_to_translate = extracted_text
+    
+    if should_summarize:
+        # Summarize, translating the summary sentence-by-sentence as it streams
+        result = _stream_summary_translation(extracted_text, source_lang, target_lang)
+        if result["success"]:
+            text_to_translate = result["summary"]
+            response_data["summary"] = text_to_translate
+            response_data["tokens_used"] = result["tokens_used"]
+    else:
         # Translate using chunked translation for large documents
         result = translate_long_text(text_to_translate, source_lang, target_lang)
-        
-        if result["success"]:
-            response_data.update({
-                "success": True,
-                "original_text": text_to_translate[:500] + "..." if len(text_to_translate) > 500 else text_to_translate,
-                "translated_text": result["translated_text"],
-                "chunks_translated": result.get("chunks_translated", 1)
-            })
-            return jsonify(response_data)
-        else:
-            return jsonify({
-                "success": False,
-                "error": result["error"]
-            }), 500
-            
-    finally:
-        # Clean up temporary file
-        if os.path.exists(temp_path):
-            os.remove(temp_path)
+    
+    if result["success"]:
+        response_data.update({
+            "success": True,
+            "original_text": _preview(text_to_translate, 500),
+            "translated_text": result["translated_text"],
+            "chunks_translated": result.get("chunks_translated", 1)
+        })
+        return jsonify(response_data)
+    else:
+        return jsonify({
+            "success": False,
+            "error": result["error"]
+        }), 500
 
 
 @app.route('/analyze', methods=['POST'])
@@ -342,76 +480,61 @@ def analyze_document():
     - prompt: Custom prompt for analysis (optional)
     """
     if 'file' not in request.files:
-        return jsonify({"success": False, "error": "No file provided"}), 400
+        return _json_error("No file provided", 400)
     
     file = request.files['file']
     
     if file.filename == '' or not allowed_file(file.filename):
-        return jsonify({"success": False, "error": "Invalid file"}), 400
+        return _json_error("Invalid file", 400)
     
     custom_prompt = request.form.get('prompt', '')
     
     filename = secure_filename(file.filename)
-    temp_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+    file_type = file.filename.rsplit('.', 1)[1].lower()
+    file_bytes = file.stream.read()
     
-    try:
-        file.save(temp_path)
-        
-        extraction_result = extract_text(temp_path)
-        
-        if not extraction_result["success"]:
-            return jsonify({
-                "success": False,
-                "error": extraction_result["error"]
-            }), 500
-        
-        extracted_text = extraction_result["text"]
-        
-        # Limit text for API
-        max_chars = 4000
-        if len(extracted_text) > max_chars:
-            extracted_text = extracted_text[:max_chars]
-        
-        # Build prompt
-        if custom_prompt:
-            prompt = f"{custom_prompt}\n\nDocument content:\n{extracted_text}"
-        else:
-            prompt = f"Analyze and summarize the following document:\n\n{extracted_text}"
-        
-        result = generate_ai_response(prompt)
-        
-        if result["success"]:
-            return jsonify({
-                "success": True,
-                "filename": filename,
-                "analysis": result["response"],
-                "tokens_used": result["usage"]["total_tokens"]
-            })
-        else:
-            return jsonify({
-                "success": False,
-                "error": result["error"]
-            }), 500
-            
-    finally:
-        if os.path.exists(temp_path):
-            os.remove(temp_path)
+    # With a job queue configured, hand off and let the client poll /jobs/<id>
+    job_id = enqueue_analysis(file_bytes, file_type, filename, custom_prompt)
+    
+    if job_id:
+        return jsonify({
+            "success": True,
+            "job_id": job_id,
+            "status": "queued",
+            "status_url": f"/jobs/{job_id}"
+        }), 202
+    
+    result = analyze_document_bytes(file_bytes, file_type, filename, custom_prompt)
+    
+    if result["success"]:
+        return jsonify(result)
+    else:
+        return jsonify(result), 500
+
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    """
+    Poll a queued /analyze job.
+    
+    Returns the job status, plus the analysis once it has finished.
+    """
+    result = get_job_status(job_id)
+    
+    if result is None:
+        return _json_error("Job not found", 404)
+    
+    return jsonify(result)
 
 
 @app.errorhandler(413)
 def too_large(e):
-    return jsonify({
-        "success": False,
-        "error": "File too large. Maximum size is 16MB."
-    }), 413
+    return _json_error("File too large. Maximum size is 16MB.", 413)
 
 
 @app.errorhandler(500)
 def internal_error(e):
-    return jsonify({
-        "success": False,
-        "error": "Internal server error"
-    }), 500
+    return _json_error("Internal server error", 500)
 
 
 if __name__ == '__main__':
@@ -424,6 +547,7 @@ if __name__ == '__main__':
     print("  POST /translate  - Translate text")
     print("  POST /upload     - Upload & translate document")
     print("  POST /analyze    - Analyze document with AI")
+    print("  GET  /jobs/<id>  - Poll a queued analysis")
     print("\nStarting server on http://127.0.0.1:5000")
     print("=" * 50 + "\n")
     
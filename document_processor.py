@@ -4,9 +4,43 @@ Document Processor Module
 Extracts text from PDF and DOCX files for translation.
 """
 
+import io
 import os
 import sys
-from typing import Optional
+import pickle
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional, Union
+
+
+def _gevent_patched() -> bool:
+    """Whether gevent has monkey-patched threading (gunicorn -k gevent via wsgi.py)."""
+    monkey = sys.modules.get("gevent.monkey")
+    return monkey is not None and monkey.is_module_patched("threading")
+
+
+def _native_lock():
+    """A real OS-thread lock, also after gevent monkey-patching (see extract_text_in_pool)."""
+    if _gevent_patched():
+        from gevent.monkey import get_original
+        return get_original("_thread", "allocate_lock")()
+    return threading.Lock()
+
+
+_PDFIUM_LOCK = _native_lock()
+
+# Extraction is CPU-bound; run it in worker processes so it doesn't hold the
+# GIL of the web worker. Each gunicorn worker has its own processes, so keep
+# this small. EXTRACT_WORKERS=0 disables the pool (extract in-process).
+EXTRACT_WORKERS = int(os.getenv("EXTRACT_WORKERS", min(2, os.cpu_count() or 1)))
+_EXTRACT_POOL: Optional[ProcessPoolExecutor] = None
+_EXTRACT_POOL_LOCK = threading.Lock()
+_GEVENT_WORKERS = None  # gevent Queue of idle extraction subprocesses (see _gevent_extract)
+
+# A document is either a path on disk or its raw bytes (e.g. an in-memory upload)
+DocumentSource = Union[str, bytes]
 
 
 def detect_columns(words, page_width, min_gap_ratio=0.05):
@@ -63,13 +97,11 @@ def detect_columns(words, page_width, min_gap_ratio=0.05):
     return columns
 
 
-def extract_text_by_columns(page, columns):
+def extract_text_by_columns(words, columns):
     """
-    Extract text from page respecting column boundaries.
+    Extract text from page words respecting column boundaries.
     Reads each column top-to-bottom, then moves to next column.
     """
-    words = page.extract_words(x_tolerance=3, y_tolerance=3)
-    
     if not words:
         return ""
     
@@ -114,7 +146,70 @@ def extract_text_by_columns(page, columns):
     return '\n\n---\n\n'.join(column_texts)
 
 
-def extract_text_from_pdf(file_path: str) -> dict:
+def _page_words(textpage, page_height):
+    """
+    Return the text segments of a PDFium text page as word dicts
+    (x0, x1, top, text) measured from the top-left corner.
+    """
+    words = []
+    for i in range(textpage.count_rects()):
+        left, bottom, right, top = textpage.get_rect(i)
+        text = textpage.get_text_bounded(left, bottom, right, top).strip()
+        if text:
+            words.append({'x0': left, 'x1': right, 'top': page_height - top, 'text': text})
+    return words
+
+
+def _iter_pdf_page_texts(pdf):
+    """
+    Yield (page_num, cleaned_text) for each PDF page that has text.
+    Pages are extracted lazily, so callers can stop early.
+    """
+    import re
+    
+    for page_num, page in enumerate(pdf, 1):
+        page_width, page_height = page.get_size()
+        textpage = page.get_textpage()
+        
+        try:
+            # Extract text segments with positions
+            words = _page_words(textpage, page_height)
+            
+            if words:
+                # Detect columns based on word positions
+                columns = detect_columns(words, page_width)
+                num_columns = len(columns)
+                
+                print(f"DEBUG: Page {page_num} - Detected {num_columns} column(s)", file=sys.stderr)
+                
+                if num_columns > 1:
+                    # Multi-column layout - extract by columns
+                    page_text = extract_text_by_columns(words, columns)
+                else:
+                    # Single column - use standard extraction
+                    page_text = textpage.get_text_range()
+            else:
+                # No segments found, try standard extraction
+                page_text = textpage.get_text_range()
+        finally:
+            textpage.close()
+            page.close()
+        
+        if page_text:
+            # Cleanup: PDFium uses CRLF line breaks, marks soft hyphens with
+            # U+FFFE (dropped, with any line break after them, to rejoin the
+            # word) and can emit lone CRs inside a line. Words hyphenated with
+            # a real hyphen at a line break (e.g. lines joined by
+            # extract_text_by_columns) are rejoined too.
+            clean_text = page_text.replace('\r\n', '\n')
+            clean_text = re.sub(r'\ufffe\n?', '', clean_text)
+            clean_text = clean_text.replace('\r', ' ')
+            clean_text = re.sub(r'[ ]{2,}', ' ', clean_text)
+            clean_text = re.sub(r'(\w+)-\n(\w+)', r'\1\2', clean_text)
+            yield page_num, clean_text
+
+
+def extract_text_from_pdf(file_path: DocumentSource, max_chars: Optional[int] = None, page_markers: bool = True) -> dict:
     """
     Extract text from a PDF file with intelligent multi-column detection.
     
@@ -122,64 +217,50 @@ def extract_text_from_pdf(file_path: str) -> dict:
     1. Detects multi-column layouts automatically
     2. Reads each column top-to-bottom before moving to the next
     3. Preserves reading order for complex documents like planning maps
+    4. Stops extracting pages once max_chars is reached
     
     Args:
-        file_path: Path to the PDF file
+        file_path: Path to the PDF file, or the PDF bytes
+        max_chars: Optional cap on returned characters; trailing pages are skipped
+        page_markers: Prefix each page with "--- Page N ---" (default True)
     
     Returns:
         dict with success status and extracted text
     """
     try:
-        import pdfplumber
-        import re
+        import pypdfium2 as pdfium
         
         text_content = []
-        
-        with pdfplumber.open(file_path) as pdf:
-            for page_num, page in enumerate(pdf.pages, 1):
-                page_width = page.width
-                page_height = page.height
-                
-                # Extract words with positions
-                words = page.extract_words(x_tolerance=3, y_tolerance=3)
-                
-                if words:
-                    # Detect columns based on word positions
-                    columns = detect_columns(words, page_width)
-                    num_columns = len(columns)
-                    
-                    print(f"DEBUG: Page {page_num} - Detected {num_columns} column(s)", file=sys.stderr)
+        total_len = 0
+        truncated = False
+        
+        # PDFium is not thread-safe; serialize access within this process
+        with _PDFIUM_LOCK:
+            pdf = pdfium.PdfDocument(file_path)
+            try:
+                for page_num, clean_text in _iter_pdf_page_texts(pdf):
+                    if page_markers:
+                        clean_text = f"--- Page {page_num} ---\n{clean_text}"
+                    text_content.append(clean_text)
+                    total_len += len(clean_text) + 2
                     
-                    if num_columns > 1:
-                        # Multi-column layout - extract by columns
-                        page_text = extract_text_by_columns(page, columns)
-                    else:
-                        # Single column - use standard extraction
-                        page_text = page.extract_text(x_tolerance=3, y_tolerance=3)
-                    
-                    if page_text:
-                        # Cleanup
-                        clean_text = re.sub(r'[ ]{2,}', ' ', page_text)
-                        clean_text = re.sub(r'(\w+)-\n(\w+)', r'\1\2', clean_text)
-                        text_content.append(f"--- Page {page_num} ---\n{clean_text}")
-                else:
-                    # No words found, try standard extraction
-                    page_text = page.extract_text(x_tolerance=3, y_tolerance=3)
-                    if page_text:
-                        clean_text = re.sub(r'[ ]{2,}', ' ', page_text)
-                        clean_text = re.sub(r'(\w+)-\n(\w+)', r'\1\2', clean_text)
-                        text_content.append(f"--- Page {page_num} ---\n{clean_text}")
+                    if max_chars is not None and total_len >= max_chars:
+                        truncated = True
+                        break
+            finally:
+                pdf.close()
         
         full_text = "\n\n".join(text_content)
         
         if not full_text.strip():
              print(f"DEBUG: No text found via native extraction. Attempting Vision OCR...", file=sys.stderr)
-             return ocr_pdf_with_vision(file_path)
+             return ocr_pdf_with_vision(file_path, max_chars=max_chars)
         
         return {
             "success": True,
-            "text": full_text,
+            "text": full_text[:max_chars] if truncated else full_text,
             "page_count": len(text_content),
+            "truncated": truncated,
             "file_type": "pdf",
             "error": None
         }
@@ -191,17 +272,23 @@ def extract_text_from_pdf(file_path: str) -> dict:
             "error": f"Failed to extract PDF text: {str(e)}"
         }
 
-def ocr_pdf_with_vision(file_path: str) -> dict:
+def ocr_pdf_with_vision(file_path: DocumentSource, max_chars: Optional[int] = None) -> dict:
     """
     Extract text from PDF using OCR (Azure OpenAI Vision) via PyMuPDF rendering.
+    Stops rendering pages once max_chars is reached.
     Note: This feature requires PyMuPDF which is not available on Render free tier.
     """
     try:
         import fitz  # PyMuPDF
         from openai_client import extract_text_from_image
         
-        doc = fitz.open(file_path)
+        if isinstance(file_path, bytes):
+            doc = fitz.open(stream=file_path, filetype="pdf")
+        else:
+            doc = fitz.open(file_path)
         text_parts = []
+        total_len = 0
+        truncated = False
         
         print(f"DEBUG: Starting OCR for {len(doc)} pages...", file=sys.stderr)
         
@@ -218,14 +305,20 @@ def ocr_pdf_with_vision(file_path: str) -> dict:
             else:
                 text_parts.append(f"--- Page {i+1} ---\n[OCR Failed]")
                 print(f"DEBUG: OCR Page {i+1} failed: {result.get('error')}", file=sys.stderr)
+            
+            total_len += len(text_parts[-1]) + 2
+            if max_chars is not None and total_len >= max_chars:
+                truncated = True
+                break
         
         doc.close()
         full_text = "\n\n".join(text_parts)
         
         return {
             "success": True,
-            "text": full_text,
+            "text": full_text[:max_chars] if truncated else full_text,
             "page_count": len(text_parts),
+            "truncated": truncated,
             "file_type": "pdf_ocr",
             "error": None
         }
@@ -243,12 +336,13 @@ def ocr_pdf_with_vision(file_path: str) -> dict:
         return {"success": False, "text": None, "error": f"OCR failed: {str(e)}"}
 
 
-def extract_text_from_docx(file_path: str) -> dict:
+def extract_text_from_docx(file_path: DocumentSource, max_chars: Optional[int] = None) -> dict:
     """
     Extract text from a DOCX file.
     
     Args:
-        file_path: Path to the DOCX file
+        file_path: Path to the DOCX file, or the DOCX bytes
+        max_chars: Optional cap on returned characters
     
     Returns:
         dict with success status and extracted text
@@ -256,14 +350,31 @@ def extract_text_from_docx(file_path: str) -> dict:
     try:
         from docx import Document
         
-        doc = Document(file_path)
-        paragraphs = [para.text for para in doc.paragraphs if para.text.strip()]
+        doc = Document(io.BytesIO(file_path) if isinstance(file_path, bytes) else file_path)
+        
+        # Read each paragraph's text once (every .text access walks its XML runs)
+        paragraphs = []
+        append = paragraphs.append
+        total_len = 0
+        stopped_early = False
+        
+        for para in doc.paragraphs:
+            text = para.text
+            if text and not text.isspace():
+                append(text)
+                total_len += len(text) + 2
+                if max_chars is not None and total_len >= max_chars:
+                    stopped_early = True
+                    break
+        
         full_text = "\n\n".join(paragraphs)
+        truncated = stopped_early or (max_chars is not None and len(full_text) > max_chars)
         
         return {
             "success": True,
-            "text": full_text,
+            "text": full_text[:max_chars] if truncated else full_text,
             "paragraph_count": len(paragraphs),
+            "truncated": truncated,
             "file_type": "docx",
             "error": None
         }
@@ -276,23 +387,35 @@ def extract_text_from_docx(file_path: str) -> dict:
         }
 
 
-def extract_text_from_txt(file_path: str) -> dict:
+def extract_text_from_txt(file_path: DocumentSource, max_chars: Optional[int] = None) -> dict:
     """
     Read text from a plain text file.
     
     Args:
-        file_path: Path to the text file
+        file_path: Path to the text file, or the UTF-8 encoded bytes
+        max_chars: Optional cap on characters read
     
     Returns:
         dict with success status and text content
     """
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            text = f.read()
+        if isinstance(file_path, bytes):
+            f = io.StringIO(file_path.decode('utf-8'))
+        else:
+            f = open(file_path, 'r', encoding='utf-8')
+        
+        with f:
+            if max_chars is None:
+                text = f.read()
+                truncated = False
+            else:
+                text = f.read(max_chars)
+                truncated = bool(f.read(1))
         
         return {
             "success": True,
             "text": text,
+            "truncated": truncated,
             "file_type": "txt",
             "error": None
         }
@@ -305,38 +428,45 @@ def extract_text_from_txt(file_path: str) -> dict:
         }
 
 
-def extract_text(file_path: str, file_type: Optional[str] = None) -> dict:
+# File type -> extractor, built once at import
+EXTRACTORS = {
+    'pdf': extract_text_from_pdf,
+    'docx': extract_text_from_docx,
+    'txt': extract_text_from_txt,
+    'text': extract_text_from_txt,
+}
+
+
+def extract_text(
+    file_path: DocumentSource,
+    file_type: Optional[str] = None,
+    max_chars: Optional[int] = None,
+    page_markers: bool = True
+) -> dict:
     """
     Extract text from a document based on file type.
     
     Args:
-        file_path: Path to the document
+        file_path: Path to the document, or its raw bytes (file_type required)
         file_type: Optional file type override ('pdf', 'docx', 'txt')
+        max_chars: Optional cap on extracted characters; extraction stops early
+        page_markers: Prefix PDF pages with "--- Page N ---" (default True)
     
     Returns:
         dict with extracted text or error
     """
-    if not os.path.exists(file_path):
-        return {
-            "success": False,
-            "text": None,
-            "error": f"File not found: {file_path}"
-        }
-    
     # Determine file type from extension if not provided
     if not file_type:
-        _, ext = os.path.splitext(file_path)
-        file_type = ext.lower().lstrip('.')
-    
-    # Route to appropriate extractor
-    extractors = {
-        'pdf': extract_text_from_pdf,
-        'docx': extract_text_from_docx,
-        'txt': extract_text_from_txt,
-        'text': extract_text_from_txt,
-    }
+        if isinstance(file_path, bytes):
+            return {
+                "success": False,
+                "text": None,
+                "error": "file_type is required when extracting from bytes"
+            }
+        file_type = file_path.rpartition('.')[2].lower()
     
-    extractor = extractors.get(file_type)
+    # Route to appropriate extractor; a missing file surfaces as the extractor's error
+    extractor = EXTRACTORS.get(file_type)
     
     if not extractor:
         return {
@@ -345,86 +475,242 @@ def extract_text(file_path: str, file_type: Optional[str] = None) -> dict:
             "error": f"Unsupported file type: {file_type}. Supported: pdf, docx, txt"
         }
     
-    return extractor(file_path)
+    if extractor is extract_text_from_pdf:
+        return extractor(file_path, max_chars=max_chars, page_markers=page_markers)
+    
+    return extractor(file_path, max_chars=max_chars)
+
+
+def _get_extract_pool() -> Optional[ProcessPoolExecutor]:
+    """
+    Get the shared extraction process pool, created on first use.
+    
+    Creating it lazily means each gunicorn worker builds its own pool after
+    fork (also under --preload). Workers are spawned, not forked, so they
+    never inherit the parent's threads, locks or open PDFium handles.
+    """
+    global _EXTRACT_POOL
+    
+    if EXTRACT_WORKERS <= 0:
+        return None
+    
+    if _EXTRACT_POOL is None:
+        with _EXTRACT_POOL_LOCK:
+            if _EXTRACT_POOL is None:
+                _EXTRACT_POOL = ProcessPoolExecutor(
+                    max_workers=EXTRACT_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+    return _EXTRACT_POOL
+
+
+def _extract_worker_main():
+    """
+    Serve extraction requests from a parent web worker (see _gevent_extract).
+    
+    Reads pickled extract_text argument tuples from stdin and writes the
+    pickled result dicts to stdout until stdin is closed. Stray prints are
+    sent to stderr so they can't corrupt the result stream.
+    """
+    results = os.fdopen(os.dup(1), "wb")
+    os.dup2(2, 1)
+    sys.stdout = sys.stderr
+    inbox = sys.stdin.buffer
+    
+    while True:
+        try:
+            args = pickle.load(inbox)
+        except EOFError:
+            return
+        
+        try:
+            result = extract_text(*args)
+        except Exception as e:
+            result = {"success": False, "text": None, "error": f"Extraction failed: {str(e)}"}
+        
+        pickle.dump(result, results)
+        results.flush()
+
+
+def _spawn_extract_worker():
+    """Start an extraction subprocess with gevent-cooperative pipes."""
+    from gevent import subprocess as gsubprocess
+    
+    return gsubprocess.Popen(
+        [sys.executable, "-c", "import document_processor; document_processor._extract_worker_main()"],
+        stdin=gsubprocess.PIPE,
+        stdout=gsubprocess.PIPE,
+        cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+
+
+def _gevent_extract(args: tuple) -> dict:
+    """
+    Run extract_text(*args) in one of EXTRACT_WORKERS subprocesses.
+    
+    concurrent.futures' process pool blocks the gevent hub (its manager
+    thread and pipe writes aren't cooperative), so gevent workers talk to
+    their own long-lived extraction processes over gevent pipes instead.
+    The greenlet yields while the subprocess works, and its CPU time never
+    touches this worker's GIL. Processes are started on first use; one
+    that dies is replaced and the request is extracted on gevent's thread
+    pool instead.
+    """
+    global _GEVENT_WORKERS
+    
+    import gevent
+    from gevent.queue import Queue
+    
+    if _GEVENT_WORKERS is None:
+        _GEVENT_WORKERS = Queue()
+        for _ in range(EXTRACT_WORKERS):
+            _GEVENT_WORKERS.put(None)
+    
+    proc = _GEVENT_WORKERS.get()
+    
+    try:
+        if proc is None:
+            proc = _spawn_extract_worker()
+        pickle.dump(args, proc.stdin)
+        proc.stdin.flush()
+        return pickle.load(proc.stdout)
+    except (OSError, EOFError, pickle.PickleError) as e:
+        print(f"DEBUG: Extraction process failed ({e}); extracting on the thread pool", file=sys.stderr)
+        if proc is not None:
+            proc.kill()
+            proc = None
+    finally:
+        _GEVENT_WORKERS.put(proc)
+    
+    return gevent.get_hub().threadpool.apply(extract_text, args)
+
+
+def extract_text_in_pool(
+    file_path: DocumentSource,
+    file_type: str,
+    max_chars: Optional[int] = None,
+    page_markers: bool = True
+) -> dict:
+    """
+    Extract text from a document in the extraction process pool.
+    
+    Same arguments and result as extract_text. Falls back to extracting
+    in-process if the pool is disabled or a worker process died.
+    
+    In gevent workers the extraction runs in gevent-managed subprocesses
+    (see _gevent_extract), or on gevent's native thread pool when
+    EXTRACT_WORKERS=0, so PDFium never runs, or waits for its lock, on
+    the hub.
+    """
+    global _EXTRACT_POOL
+    
+    args = (file_path, file_type, max_chars, page_markers)
+    
+    if _gevent_patched():
+        if EXTRACT_WORKERS > 0:
+            return _gevent_extract(args)
+        import gevent
+        return gevent.get_hub().threadpool.apply(extract_text, args)
+    
+    pool = _get_extract_pool()
+    
+    if pool is not None:
+        try:
+            return pool.submit(extract_text, *args).result()
+        except BrokenProcessPool:
+            print("DEBUG: Extraction pool broken; recreating and extracting in-process", file=sys.stderr)
+            with _EXTRACT_POOL_LOCK:
+                if _EXTRACT_POOL is pool:
+                    _EXTRACT_POOL = None
+            pool.shutdown(wait=False)
+    
+    return extract_text(*args)
 
 
 # ... (existing imports)
-from translator import translate_text, translate_long_text
+from translator import translate_texts, translate_long_text
+
+# Runs/paragraphs longer than this are chunked with translate_long_text
+SEGMENT_CHUNK_SIZE = 5000
 
-def translate_paragraph_runs(para, source_lang: str, target_lang: str) -> int:
+
+def translate_segments(texts: list, source_lang: str, target_lang: str) -> list:
     """
-    Translate paragraph by translating each run individually to preserve formatting.
-    Returns count of translated runs.
+    Translate document segments (runs, paragraphs) together.
+    
+    Segments are packed into shared Translator requests via translate_texts;
+    the rare segment longer than SEGMENT_CHUNK_SIZE is chunked on its own.
+    Returns one result dict per segment, in order.
     """
-    translated_count = 0
-    runs_with_text = [r for r in para.runs if r.text and r.text.strip()]
+    results = [None] * len(texts)
+    short = [i for i, text in enumerate(texts) if len(text) <= SEGMENT_CHUNK_SIZE]
     
-    if not runs_with_text:
-        # No runs with text - paragraph might have text but no runs (common in converted PDFs)
-        return 0
+    for i, result in zip(short, translate_texts([texts[i] for i in short], source_lang, target_lang)):
+        results[i] = result
     
-    for run in runs_with_text:
-        # Use translate_long_text for potentially large runs
-        result = translate_long_text(run.text, source_lang, target_lang)
-        if result["success"]:
-            # Preserve the run's text while keeping all formatting (bold, italic, font, etc.)
-            run.text = result["translated_text"]
-            translated_count += 1
-        else:
-            print(f"DEBUG: Run translation failed: {result.get('error')}", file=sys.stderr)
+    for i, text in enumerate(texts):
+        if results[i] is None:
+            results[i] = translate_long_text(text, source_lang, target_lang, chunk_size=SEGMENT_CHUNK_SIZE)
+    
+    return results
+
+
+def _translatable_targets(para) -> list:
+    """
+    The objects whose .text gets translated for a paragraph: each run with
+    text (preserving bold, italic, fonts, etc.), or the paragraph itself
+    when its text isn't in runs (common in converted PDFs).
+    """
+    if not para.text.strip():
+        return []
     
-    return translated_count
+    runs_with_text = [r for r in para.runs if r.text and r.text.strip()]
+    return runs_with_text or [para]
 
-def translate_docx_file(file_path: str, output_path: str, source_lang: str, target_lang: str) -> dict:
+
+def translate_docx_file(file_path: DocumentSource, output_path: str, source_lang: str, target_lang: str) -> dict:
     """
-    Translate a DOCX file preserving formatting.
+    Translate a DOCX file (path or raw bytes) preserving formatting.
     """
     try:
         from docx import Document
         
-        print(f"DEBUG: Opening DOCX: {file_path}", file=sys.stderr)
-        doc = Document(file_path)
+        if isinstance(file_path, bytes):
+            print(f"DEBUG: Opening DOCX from memory ({len(file_path)} bytes)", file=sys.stderr)
+            doc = Document(io.BytesIO(file_path))
+        else:
+            print(f"DEBUG: Opening DOCX: {file_path}", file=sys.stderr)
+            doc = Document(file_path)
         
         para_count = len(doc.paragraphs)
         table_count = len(doc.tables)
         print(f"DEBUG: Found {para_count} paragraphs and {table_count} tables.", file=sys.stderr)
         
-        translated_count = 0
-        
-        # Translate paragraphs - use run-level translation to preserve formatting
-        for i, para in enumerate(doc.paragraphs):
-            if para.text.strip():
-                # Translate each run individually to preserve bold, italic, fonts, etc.
-                runs_translated = translate_paragraph_runs(para, source_lang, target_lang)
-                if runs_translated > 0:
-                    translated_count += runs_translated
-                    print(f"DEBUG: Para {i} - translated {runs_translated} runs", file=sys.stderr)
-                elif para.text.strip():
-                    # Fallback: If no runs but text exists, translate whole paragraph
-                    print(f"DEBUG: Para {i} - no runs, using paragraph-level translation ({len(para.text)} chars)", file=sys.stderr)
-                    result = translate_long_text(para.text, source_lang, target_lang)
-                    if result["success"]:
-                        para.text = result["translated_text"]
-                        translated_count += 1
-                    else:
-                        print(f"DEBUG: Translation failed for para {i}: {result.get('error')}", file=sys.stderr)
-
-        # Translate tables - use run-level translation to preserve formatting
-        for t_idx, table in enumerate(doc.tables):
+        # Collect body and table paragraphs. Merged table cells repeat in
+        # row.cells, so each underlying paragraph is only taken once.
+        paragraphs = list(doc.paragraphs)
+        seen = set()
+        for table in doc.tables:
             for row in table.rows:
                 for cell in row.cells:
                     for para in cell.paragraphs:
-                        if para.text.strip():
-                            # Translate each run individually to preserve formatting
-                            runs_translated = translate_paragraph_runs(para, source_lang, target_lang)
-                            if runs_translated > 0:
-                                translated_count += runs_translated
-                            elif para.text.strip():
-                                # Fallback for paragraphs without runs
-                                result = translate_long_text(para.text, source_lang, target_lang)
-                                if result["success"]:
-                                    para.text = result["translated_text"]
-                                    translated_count += 1
+                        if id(para._p) not in seen:
+                            seen.add(id(para._p))
+                            paragraphs.append(para)
+        
+        # Translate every run (or run-less paragraph) in the document together
+        targets = [target for para in paragraphs for target in _translatable_targets(para)]
+        print(f"DEBUG: Translating {len(targets)} segments...", file=sys.stderr)
+        results = translate_segments([target.text for target in targets], source_lang, target_lang)
+        
+        translated_count = 0
+        
+        for target, result in zip(targets, results):
+            if result["success"]:
+                target.text = result["translated_text"]
+                translated_count += 1
+            else:
+                print(f"DEBUG: Segment translation failed: {result.get('error')}", file=sys.stderr)
         
         print(f"DEBUG: Total translated segments: {translated_count}", file=sys.stderr)
         
@@ -482,6 +768,11 @@ def create_simple_translated_docx(text: str, output_path: str, source_lang: str,
         
         print(f"DEBUG: Creating professional DOCX - {len(paragraphs)} sections", file=sys.stderr)
         
+        # Translate all text sections up front, together
+        markers = ('[PAGE_BREAK]', '[SECTION_BREAK]')
+        sections = [para.strip() for para in paragraphs if para.strip() and para.strip() not in markers]
+        section_results = iter(translate_segments(sections, source_lang, target_lang))
+        
         translated_count = 0
         
         for i, para in enumerate(paragraphs):
@@ -504,8 +795,8 @@ def create_simple_translated_docx(text: str, output_path: str, source_lang: str,
                 p.paragraph_format.space_after = Pt(12)
                 continue
             
-            # Translate the paragraph
-            result = translate_long_text(para, source_lang, target_lang)
+            # Translated paragraph
+            result = next(section_results)
             if result["success"]:
                 translated_text = result["translated_text"]
                 translated_count += 1
@@ -597,18 +888,34 @@ def convert_pdf_to_docx(pdf_path: str, docx_path: str) -> dict:
     except Exception as e:
         return {"success": False, "error": f"PDF conversion failed: {str(e)}"}
 
-def translate_document_file(file_path: str, output_path: str, source_lang: str, target_lang: str) -> dict:
+def translate_document_file(
+    file_path: DocumentSource,
+    output_path: str,
+    source_lang: str,
+    target_lang: str,
+    file_type: Optional[str] = None
+) -> dict:
     """
     Translate document preserving format (converts PDF to DOCX).
+    
+    Args:
+        file_path: Path to the document, or its raw bytes (file_type required)
+        output_path: Where to write the translated DOCX
+        source_lang: Source language code
+        target_lang: Target language code
+        file_type: Optional file type override ('pdf', 'docx')
     """
-    print(f"DEBUG: translate_document_file called with {file_path}", file=sys.stderr)
-    _, ext = os.path.splitext(file_path)
-    ext = ext.lower()
+    if not file_type:
+        if isinstance(file_path, bytes):
+            return {"success": False, "error": "file_type is required when translating from bytes"}
+        file_type = file_path.rpartition('.')[2].lower()
+    
+    print(f"DEBUG: translate_document_file called for a {file_type} document", file=sys.stderr)
     
-    if ext == '.docx':
+    if file_type == 'docx':
         return translate_docx_file(file_path, output_path, source_lang, target_lang)
     
-    elif ext == '.pdf':
+    elif file_type == 'pdf':
         # For PDFs: Extract text directly and create translated DOCX
         # This is more reliable than pdf2docx conversion
         print(f"DEBUG: Processing PDF file...", file=sys.stderr)
@@ -616,8 +923,8 @@ def translate_document_file(file_path: str, output_path: str, source_lang: str,
         if not output_path.endswith('.docx'):
             output_path += '.docx'
         
-        # Step 1: Extract text from PDF using pdfplumber
-        extraction = extract_text_from_pdf(file_path)
+        # Step 1: Extract text from PDF using PDFium, off the web worker
+        extraction = extract_text_in_pool(file_path, 'pdf')
         
         if not extraction["success"]:
             print(f"DEBUG: PDF text extraction failed: {extraction.get('error')}", file=sys.stderr)
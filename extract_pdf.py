@@ -1,8 +1,8 @@
-import pdfplumber
+import pypdfium2 as pdfium
 
-with pdfplumber.open(r'c:\Users\UmarKhan\Downloads\Service.pdf') as pdf:
-    text = ''
-    for page in pdf.pages:
-        text += page.extract_text() + '\n'
+pdf = pdfium.PdfDocument(r'c:\Users\UmarKhan\Downloads\Service.pdf')
+text = ''
+for page in pdf:
+    text += page.get_textpage().get_text_range() + '\n'
 
 print(text)
\ No newline at end of file
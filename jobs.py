@@ -0,0 +1,196 @@
+"""
+Background Jobs Module
+
+Runs document analysis outside the request cycle with RQ (Redis Queue) so
+slow extraction + Azure OpenAI round-trips don't pin web workers.
+
+Enabled when REDIS_URL is set and the rq package is installed:
+
+    pip install redis rq
+    rq worker analyze --url $REDIS_URL
+
+Without them, /analyze runs the same job function synchronously.
+"""
+
+import os
+import sys
+import uuid
+import threading
+from typing import Optional
+
+from document_processor import extract_text, extract_text_in_pool
+from openai_client import generate_ai_response
+
+ANALYZE_QUEUE = "analyze"
+ANALYZE_MAX_CHARS = 4000
+JOB_TIMEOUT = 300           # seconds a worker may spend on one analysis
+JOB_RESULT_TTL = 60 * 60    # keep finished results for an hour of polling
+UPLOAD_TTL = 60 * 60        # queued uploads not picked up within an hour expire
+UPLOAD_KEY_PREFIX = "analyze:upload:"
+
+_QUEUE = None
+_QUEUE_CHECKED = False
+_QUEUE_LOCK = threading.Lock()
+
+
+def _analyze_extraction(extraction_result: dict, filename: str, custom_prompt: str) -> dict:
+    """Analyze extracted document text with Azure OpenAI (see analyze_document_bytes)."""
+    if not extraction_result["success"]:
+        return {
+            "success": False,
+            "error": extraction_result["error"]
+        }
+    
+    extracted_text = extraction_result["text"]
+    
+    # Build prompt
+    if custom_prompt:
+        prompt = f"{custom_prompt}\n\nDocument content:\n{extracted_text}"
+    else:
+        prompt = f"Analyze and summarize the following document:\n\n{extracted_text}"
+    
+    result = generate_ai_response(prompt)
+    
+    if not result["success"]:
+        return {
+            "success": False,
+            "error": result["error"]
+        }
+    
+    return {
+        "success": True,
+        "filename": filename,
+        "analysis": result["response"],
+        "tokens_used": result["usage"]["total_tokens"]
+    }
+
+
+def analyze_document_bytes(file_bytes: bytes, file_type: str, filename: str, custom_prompt: str = "") -> dict:
+    """
+    Extract a document's text and analyze it with Azure OpenAI.
+    
+    Used inline by the web app when no queue is configured; extraction runs
+    in the extraction pool so it never blocks the web worker.
+    
+    Args:
+        file_bytes: Raw document bytes
+        file_type: Document type ('pdf', 'docx', 'txt')
+        filename: Original (sanitized) filename, echoed in the result
+        custom_prompt: Optional instruction to use instead of the default
+    
+    Returns:
+        dict with analysis, tokens_used or error
+    """
+    # Limit text for API; extraction stops once this much text is read
+    extraction_result = extract_text_in_pool(file_bytes, file_type, max_chars=ANALYZE_MAX_CHARS, page_markers=False)
+    return _analyze_extraction(extraction_result, filename, custom_prompt)
+
+
+def run_analysis_job(upload_key: str, file_type: str, filename: str, custom_prompt: str = "") -> dict:
+    """
+    RQ entry point for a queued analysis; same result as analyze_document_bytes.
+    
+    The document is read from (and then deleted at) upload_key in Redis,
+    where enqueue_analysis stored it. The RQ work horse is its own process,
+    so it extracts directly.
+    """
+    from rq import get_current_job
+    
+    connection = get_current_job().connection
+    file_bytes = connection.get(upload_key)
+    
+    if file_bytes is None:
+        return {
+            "success": False,
+            "error": "Uploaded document expired before the analysis started"
+        }
+    
+    try:
+        extraction_result = extract_text(file_bytes, file_type=file_type, max_chars=ANALYZE_MAX_CHARS, page_markers=False)
+    finally:
+        connection.delete(upload_key)
+    
+    return _analyze_extraction(extraction_result, filename, custom_prompt)
+
+
+def get_queue():
+    """
+    Return the RQ analysis queue, or None when REDIS_URL is unset or
+    redis/rq are not installed.
+    """
+    global _QUEUE, _QUEUE_CHECKED
+    
+    if not _QUEUE_CHECKED:
+        with _QUEUE_LOCK:
+            if not _QUEUE_CHECKED:
+                url = os.getenv("REDIS_URL")
+                if url:
+                    try:
+                        from redis import Redis
+                        from rq import Queue
+                        _QUEUE = Queue(ANALYZE_QUEUE, connection=Redis.from_url(url))
+                    except ImportError:
+                        print("DEBUG: REDIS_URL set but rq is not installed; /analyze runs inline", file=sys.stderr)
+                _QUEUE_CHECKED = True
+    
+    return _QUEUE
+
+
+def enqueue_analysis(file_bytes: bytes, file_type: str, filename: str, custom_prompt: str = "") -> Optional[str]:
+    """
+    Queue a document analysis job.
+    
+    The document is stored under its own Redis key (expiring after
+    UPLOAD_TTL) and only that key goes into the job, so job data stays small.
+    
+    Returns:
+        The job ID, or None when background jobs are not available
+    """
+    queue = get_queue()
+    
+    if queue is None:
+        return None
+    
+    upload_key = f"{UPLOAD_KEY_PREFIX}{uuid.uuid4().hex}"
+    queue.connection.set(upload_key, file_bytes, ex=UPLOAD_TTL)
+    
+    job = queue.enqueue(
+        run_analysis_job,
+        upload_key, file_type, filename, custom_prompt,
+        job_timeout=JOB_TIMEOUT,
+        result_ttl=JOB_RESULT_TTL,
+        failure_ttl=JOB_RESULT_TTL
+    )
+    return job.id
+
+
+def get_job_status(job_id: str) -> Optional[dict]:
+    """
+    Look up a queued analysis job.
+    
+    Returns:
+        dict with job_id, status and (once finished) the analysis result,
+        or None if background jobs are disabled or the job is unknown
+    """
+    queue = get_queue()
+    
+    if queue is None:
+        return None
+    
+    from rq.exceptions import NoSuchJobError
+    from rq.job import Job
+    
+    try:
+        job = Job.fetch(job_id, connection=queue.connection)
+    except NoSuchJobError:
+        return None
+    
+    status = job.get_status()
+    result = {"job_id": job_id, "status": status.value if status else "unknown"}
+    
+    if job.is_finished:
+        result.update(job.return_value() or {})
+    elif job.is_failed:
+        result.update({"success": False, "error": "Analysis job failed"})
+    
+    return result
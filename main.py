@@ -9,13 +9,41 @@ Flow: Input Data -> Azure OpenAI (summary) -> Azure Translator (language convers
 
 import sys
 import json
-from translator import translate_text
+import queue
+import atexit
+import logging
+import logging.handlers
+from translator import translate_text, translate_long_text
 from openai_client import generate_ai_response, summarize_text
 
 # Fix Windows console encoding
 if sys.platform == "win32":
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
 
+log = logging.getLogger(__name__)
+
+
+def _configure_logging() -> None:
+    """
+    Send this module's log records through a queue drained by a background
+    thread, so the pipeline never blocks on stdout writes.
+    """
+    log_queue = queue.Queue(-1)
+    
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    
+    listener = logging.handlers.QueueListener(log_queue, handler)
+    listener.start()
+    atexit.register(listener.stop)  # Flush queued records on exit
+    
+    log.addHandler(logging.handlers.QueueHandler(log_queue))
+    log.setLevel(logging.INFO)
+    log.propagate = False
+
+
+_configure_logging()
+
 
 def process_and_translate(
     input_text: str,
@@ -35,9 +63,9 @@ def process_and_translate(
     Returns:
         dict containing all processing results
     """
-    print("\n" + "=" * 60)
-    print(">>> AZURE AI INTEGRATION PIPELINE")
-    print("=" * 60)
+    log.info("\n" + "=" * 60)
+    log.info(">>> AZURE AI INTEGRATION PIPELINE")
+    log.info("=" * 60)
     
     result = {
         "input": input_text,
@@ -46,39 +74,40 @@ def process_and_translate(
     }
     
     # Stage 1: Summarize with Azure OpenAI
-    print("\n[STAGE 1] Generating Summary with Azure OpenAI...")
-    print("-" * 40)
+    log.info("\n[STAGE 1] Generating Summary with Azure OpenAI...")
+    log.info("-" * 40)
     
     summary_result = summarize_text(input_text, style=summary_style)
     result["stages"]["openai_summary"] = summary_result
     
     if not summary_result["success"]:
-        print(f"[ERROR] Summary generation failed: {summary_result['error']}")
+        log.error("[ERROR] Summary generation failed: %s", summary_result["error"])
         result["success"] = False
         result["error"] = f"OpenAI stage failed: {summary_result['error']}"
         return result
     
     summary = summary_result["response"]
-    print(f"[OK] Summary Generated:")
-    print(f"   {summary[:200]}..." if len(summary) > 200 else f"   {summary}")
-    print(f"   (Tokens used: {summary_result['usage']['total_tokens']})")
+    log.info("[OK] Summary Generated:")
+    log.info("   %s", summary[:200] + "..." if len(summary) > 200 else summary)
+    log.info("   (Tokens used: %s)", summary_result["usage"]["total_tokens"])
     
     # Stage 2: Translate with Azure Translator
-    print(f"\n[STAGE 2] Translating to {target_language.upper()} with Azure Translator...")
-    print("-" * 40)
+    log.info("\n[STAGE 2] Translating to %s with Azure Translator...", target_language.upper())
+    log.info("-" * 40)
     
-    translation_result = translate_text(summary, "en", target_language)
+    # Long summaries are split and their chunks translated concurrently
+    translation_result = translate_long_text(summary, "en", target_language)
     result["stages"]["translator"] = translation_result
     
     if not translation_result["success"]:
-        print(f"[ERROR] Translation failed: {translation_result['error']}")
+        log.error("[ERROR] Translation failed: %s", translation_result["error"])
         result["success"] = False
         result["error"] = f"Translator stage failed: {translation_result['error']}"
         return result
     
     translated_text = translation_result["translated_text"]
-    print(f"[OK] Translation Complete:")
-    print(f"   {translated_text[:200]}..." if len(translated_text) > 200 else f"   {translated_text}")
+    log.info("[OK] Translation Complete:")
+    log.info("   %s", translated_text[:200] + "..." if len(translated_text) > 200 else translated_text)
     
     # Final result
     result["success"] = True
@@ -94,9 +123,9 @@ def process_and_translate(
 
 def demo_translator_only():
     """Demonstrate Azure Translator standalone usage."""
-    print("\n" + "=" * 60)
-    print(">>> AZURE TRANSLATOR DEMO")
-    print("=" * 60)
+    log.info("\n" + "=" * 60)
+    log.info(">>> AZURE TRANSLATOR DEMO")
+    log.info("=" * 60)
     
     test_texts = [
         ("Hello, how are you today?", "en", "hi"),
@@ -105,33 +134,33 @@ def demo_translator_only():
     ]
     
     for text, source, target in test_texts:
-        print(f"\n[*] Translating: '{text}'")
-        print(f"   From: {source} -> To: {target}")
+        log.info("\n[*] Translating: '%s'", text)
+        log.info("   From: %s -> To: %s", source, target)
         
         result = translate_text(text, source, target)
         
         if result["success"]:
-            print(f"   [OK] Result: {result['translated_text']}")
+            log.info("   [OK] Result: %s", result["translated_text"])
         else:
-            print(f"   [ERROR] {result['error']}")
+            log.error("   [ERROR] %s", result["error"])
 
 
 def demo_openai_only():
     """Demonstrate Azure OpenAI standalone usage."""
-    print("\n" + "=" * 60)
-    print(">>> AZURE OPENAI DEMO")
-    print("=" * 60)
+    log.info("\n" + "=" * 60)
+    log.info(">>> AZURE OPENAI DEMO")
+    log.info("=" * 60)
     
     # Test 1: Simple question
-    print("\n[*] Test 1: Simple Question")
+    log.info("\n[*] Test 1: Simple Question")
     result = generate_ai_response("What are the three primary colors?")
     if result["success"]:
-        print(f"   [OK] Response: {result['response']}")
+        log.info("   [OK] Response: %s", result["response"])
     else:
-        print(f"   [ERROR] {result['error']}")
+        log.error("   [ERROR] %s", result["error"])
     
     # Test 2: Summarization
-    print("\n[*] Test 2: Text Summarization")
+    log.info("\n[*] Test 2: Text Summarization")
     sample_text = """
     Artificial intelligence (AI) is transforming how we live and work. 
     From virtual assistants that help us manage our daily tasks to advanced 
@@ -142,17 +171,17 @@ def demo_openai_only():
     """
     result = summarize_text(sample_text, style="concise")
     if result["success"]:
-        print(f"   [OK] Summary: {result['response']}")
+        log.info("   [OK] Summary: %s", result["response"])
     else:
-        print(f"   [ERROR] {result['error']}")
+        log.error("   [ERROR] %s", result["error"])
 
 
 def main():
     """Main function demonstrating the complete Azure AI integration."""
     
-    print("\n" + "*" * 60)
-    print("    AZURE AI INTEGRATION APPLICATION")
-    print("*" * 60)
+    log.info("\n" + "*" * 60)
+    log.info("    AZURE AI INTEGRATION APPLICATION")
+    log.info("*" * 60)
     
     # Example input text for the full pipeline
     sample_article = """
@@ -168,9 +197,9 @@ def main():
     """
     
     # Run the full pipeline: OpenAI -> Translator
-    print("\n" + ">" * 40)
-    print("  RUNNING FULL PIPELINE: OpenAI -> Translator")
-    print(">" * 40)
+    log.info("\n" + ">" * 40)
+    log.info("  RUNNING FULL PIPELINE: OpenAI -> Translator")
+    log.info(">" * 40)
     
     result = process_and_translate(
         input_text=sample_article,
@@ -179,24 +208,24 @@ def main():
     )
     
     # Print final results
-    print("\n" + "=" * 60)
-    print(">>> FINAL RESULTS")
-    print("=" * 60)
+    log.info("\n" + "=" * 60)
+    log.info(">>> FINAL RESULTS")
+    log.info("=" * 60)
     
     if result["success"]:
-        print(f"\n[SUCCESS] Pipeline completed successfully!")
-        print(f"\n[Original Text (English)]:")
-        print(f"   {result['final_output']['original_text'][:150]}...")
-        print(f"\n[AI Summary (English)]:")
-        print(f"   {result['final_output']['english_summary']}")
-        print(f"\n[Translated Summary ({result['final_output']['target_language']})]:")
-        print(f"   {result['final_output']['translated_summary']}")
+        log.info("\n[SUCCESS] Pipeline completed successfully!")
+        log.info("\n[Original Text (English)]:")
+        log.info("   %s...", result["final_output"]["original_text"][:150])
+        log.info("\n[AI Summary (English)]:")
+        log.info("   %s", result["final_output"]["english_summary"])
+        log.info("\n[Translated Summary (%s)]:", result["final_output"]["target_language"])
+        log.info("   %s", result["final_output"]["translated_summary"])
     else:
-        print(f"\n[FAILED] Pipeline failed: {result['error']}")
-        print("\n[Troubleshooting Tips]:")
-        print("   1. Check that your .env file has valid API keys")
-        print("   2. Verify the Azure OpenAI endpoint URL is correct")
-        print("   3. Ensure the deployment name matches your Azure portal")
+        log.error("\n[FAILED] Pipeline failed: %s", result["error"])
+        log.info("\n[Troubleshooting Tips]:")
+        log.info("   1. Check that your .env file has valid API keys")
+        log.info("   2. Verify the Azure OpenAI endpoint URL is correct")
+        log.info("   3. Ensure the deployment name matches your Azure portal")
     
     # Uncomment to run individual demos:
     # demo_translator_only()
@@ -9,13 +9,353 @@ Model: gpt-4o-mini
 """
 
 import os
-from openai import AzureOpenAI
+import sys
+import json
+import asyncio
+import hashlib
+import logging
+import threading
+import weakref
+from dataclasses import dataclass, replace
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from urllib.parse import urlsplit
+import httpx
+import openai
+import orjson
+from cachetools import TTLCache
+from openai import AzureOpenAI, AsyncAzureOpenAI
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_random_exponential
 from dotenv import load_dotenv
-from typing import Optional, List, Dict
+from typing import Callable, Optional, List, Dict, Iterator, Union
+
+from text_utils import split_text_chunks
+
+try:
+    import xxhash
+except ImportError:  # listed in requirements.txt; _digest falls back to BLAKE2b without it
+    xxhash = None
 
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+# Maximum number of chunk requests in flight at once for a single document
+MAX_CONCURRENT_REQUESTS = 8
+
+# Batch jobs need a newer API version than real-time calls (GA since 2024-10-21)
+BATCH_API_VERSION = "2024-10-21"
+
+# First API version that reports token usage at the end of a stream (stream_options)
+STREAM_USAGE_API_VERSION = "2024-09-01-preview"
+
+# Semantic cache: minimum cosine similarity for a hit, and the longest prompt
+# considered (long documents differ in details an embedding glosses over)
+SEMANTIC_CACHE_THRESHOLD = 0.95
+SEMANTIC_CACHE_MAX_CHARS = 8000
+# ...and only requests below this temperature use it (the exact cache allows up to 0.3)
+SEMANTIC_CACHE_MAX_TEMPERATURE = 0.3
+
+# summarize_text / explain_text handle longer texts map-reduce style, in chunks of this many tokens
+LONG_TEXT_TOKENS = 3000
+# ...combining partial results in at most this many rounds
+MAX_REDUCE_ROUNDS = 4
+
+
+@dataclass(frozen=True, slots=True)
+class _OpenAIConfig:
+    """Azure OpenAI settings, read from the environment once at import (see configure)."""
+    api_key: Optional[str]
+    endpoint: Optional[str]
+    deployment_name: str
+    api_version: str
+    batch_deployment_name: str
+    batch_api_version: str
+    # Embedding deployment for the semantic response cache (off when unset)
+    embedding_deployment_name: Optional[str]
+    
+    @classmethod
+    def from_env(cls) -> "_OpenAIConfig":
+        deployment_name = os.environ.get("AZURE_OPENAI_DEPLOYMENT_NAME", "gpt-4o-mini")
+        return cls(
+            api_key=os.environ.get("AZURE_OPENAI_API_KEY"),
+            endpoint=os.environ.get("AZURE_OPENAI_ENDPOINT"),
+            deployment_name=deployment_name,
+            api_version=os.environ.get("AZURE_OPENAI_API_VERSION", "2024-02-15-preview"),
+            batch_deployment_name=os.environ.get("AZURE_OPENAI_BATCH_DEPLOYMENT_NAME") or deployment_name,
+            batch_api_version=os.environ.get("AZURE_OPENAI_BATCH_API_VERSION", BATCH_API_VERSION),
+            embedding_deployment_name=os.environ.get("AZURE_OPENAI_EMBEDDING_DEPLOYMENT_NAME")
+        )
+
+
+_CONFIG = _OpenAIConfig.from_env()
+
+_HTTP_CLIENT: Optional[httpx.Client] = None
+_HTTP_CLIENT_LOCK = threading.Lock()
+
+# Client for the environment configuration, created on first use
+_DEFAULT_CLIENT: Optional[AzureOpenAI] = None
+_CLIENT_LOCK = threading.Lock()
+
+# Async clients, per event loop: {loop: {(api_key, endpoint, api_version): client}}
+_ASYNC_CLIENTS: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def _digest(data: bytes) -> str:
+    """
+    128-bit hex digest for cache keys: XXH3 when xxhash is installed, else
+    BLAKE2b. Cache keys are not a security boundary, so a fast
+    non-cryptographic hash is enough.
+    """
+    if xxhash is not None:
+        return xxhash.xxh3_128_hexdigest(data)
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    TTL + LRU cache of successful chat completion results.
+    
+    Keyed by a digest of every parameter that shapes the completion, so only
+    truly identical requests share a result. Thread-safe.
+    """
+    
+    # Above this temperature callers expect varied output; never cache it
+    MAX_TEMPERATURE = 0.3
+    
+    def __init__(self, maxsize: int = 1000, ttl: int = 3600):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+    
+    @staticmethod
+    def make_key(
+        prompt: str,
+        system_message: Optional[str],
+        model: str,
+        temperature: float,
+        max_tokens: int
+    ) -> str:
+        """Hash the request parameters into a cache key."""
+        return _digest(orjson.dumps({
+            "prompt": prompt,
+            "system": system_message,
+            "model": model,
+            "temperature": temperature,
+            "max_tokens": max_tokens
+        }, option=orjson.OPT_SORT_KEYS))
+    
+    def get(self, key: str) -> Optional[dict]:
+        """Return a copy of the cached result, or None on a miss."""
+        with self._lock:
+            value = self._cache.get(key)
+            if value is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+        return dict(value)
+    
+    def set(self, key: str, value: dict) -> None:
+        """Cache a successful result."""
+        with self._lock:
+            self._cache[key] = dict(value)
+    
+    def stats(self) -> dict:
+        """Hit/miss counters and current size, for monitoring."""
+        with self._lock:
+            return {"hits": self._hits, "misses": self._misses, "size": len(self._cache)}
+
+
+_RESPONSE_CACHE = LLMResponseCache()
+
+
+class SemanticResponseCache:
+    """
+    Near-duplicate lookup behind LLMResponseCache: completion results keyed
+    by the embedding of their prompt, matched by cosine similarity.
+    
+    Catches prompts that differ only in whitespace, punctuation or phrasing.
+    Entries are partitioned by everything else that shapes the completion
+    (see LLMResponseCache.make_key), so only prompts are compared. Each
+    partition keeps its unit vectors in one numpy matrix, so a lookup is a
+    single matrix-vector product. Prompt embeddings are cached too.
+    Thread-safe; requires numpy.
+    """
+    
+    def __init__(self, threshold: float = SEMANTIC_CACHE_THRESHOLD, maxsize: int = 1000, ttl: int = 3600):
+        self.threshold = threshold
+        self.maxsize = maxsize
+        # {context key: (matrix of unit vectors, [result, ...])}, newest rows last
+        self._partitions = TTLCache(maxsize=64, ttl=ttl)
+        self._vectors = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _prompt_key(prompt: str) -> str:
+        return _digest(prompt.encode('utf-8'))
+    
+    def vector_for(self, prompt: str):
+        """Return the cached unit embedding of prompt, or None."""
+        with self._lock:
+            return self._vectors.get(self._prompt_key(prompt))
+    
+    def store_vector(self, prompt: str, embedding: List[float]):
+        """Normalize and cache an embedding of prompt; returns the unit vector."""
+        import numpy as np
+        
+        vector = np.asarray(embedding, dtype=np.float32)
+        vector /= np.linalg.norm(vector)
+        with self._lock:
+            self._vectors[self._prompt_key(prompt)] = vector
+        return vector
+    
+    def get(self, context: str, vector) -> Optional[dict]:
+        """Return a copy of the most similar cached result, or None if none reaches the threshold."""
+        with self._lock:
+            partition = self._partitions.get(context)
+            if partition is None:
+                return None
+            matrix, results = partition
+            scores = matrix @ vector
+            best = int(scores.argmax())
+            if scores[best] < self.threshold:
+                return None
+            return dict(results[best])
+    
+    def set(self, context: str, vector, value: dict) -> None:
+        """Cache a successful result under its prompt's unit vector."""
+        import numpy as np
+        
+        with self._lock:
+            matrix, results = self._partitions.get(context, (None, []))
+            row = vector[np.newaxis, :]
+            matrix = row if matrix is None else np.vstack((matrix, row))[-self.maxsize:]
+            self._partitions[context] = (matrix, (results + [dict(value)])[-self.maxsize:])
+
+
+_SEMANTIC_CACHE: Optional[SemanticResponseCache] = None
+_SEMANTIC_CACHE_CHECKED = False
+
+
+def _semantic_cache() -> Optional[SemanticResponseCache]:
+    """
+    Return the semantic response cache, or None when no embedding deployment
+    is configured (AZURE_OPENAI_EMBEDDING_DEPLOYMENT_NAME) or numpy is missing.
+    """
+    global _SEMANTIC_CACHE, _SEMANTIC_CACHE_CHECKED
+    
+    if not _SEMANTIC_CACHE_CHECKED:
+        with _CLIENT_LOCK:
+            if not _SEMANTIC_CACHE_CHECKED:
+                if _CONFIG.embedding_deployment_name:
+                    try:
+                        import numpy  # noqa: F401
+                        _SEMANTIC_CACHE = SemanticResponseCache()
+                    except ImportError:
+                        logger.warning("Embedding deployment set but numpy is not installed; semantic cache disabled")
+                _SEMANTIC_CACHE_CHECKED = True
+    
+    return _SEMANTIC_CACHE
+
+# Transient failures worth retrying: 429, 5xx, timeouts and dropped connections
+_RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.InternalServerError,
+    openai.APIConnectionError,  # includes APITimeoutError
+)
+_MAX_RETRY_AFTER = 30  # seconds; longer waits are better surfaced as errors
+_backoff = wait_random_exponential(multiplier=0.5, max=8)
+
+
+def _retry_wait(retry_state) -> float:
+    """Wait as long as the service's Retry-After asks, else back off exponentially."""
+    response = getattr(retry_state.outcome.exception(), "response", None)
+    
+    if response is not None:
+        try:
+            return min(float(response.headers.get("retry-after")), _MAX_RETRY_AFTER)
+        except (TypeError, ValueError):
+            pass
+    
+    return _backoff(retry_state)
+
+
+# Up to 3 attempts. The SDK's own retries are disabled (max_retries=0) so the two don't compound.
+_with_retries = retry(
+    stop=stop_after_attempt(3),
+    wait=_retry_wait,
+    retry=retry_if_exception_type(_RETRYABLE_ERRORS),
+    reraise=True
+)
+
+
+@_with_retries
+def _create_completion(client: AzureOpenAI, **kwargs):
+    """client.chat.completions.create with retries on transient errors."""
+    return client.chat.completions.create(**kwargs)
+
+
+@_with_retries
+async def _acreate_completion(client: AsyncAzureOpenAI, **kwargs):
+    """Async _create_completion."""
+    return await client.chat.completions.create(**kwargs)
+
+
+def get_http_client() -> httpx.Client:
+    """
+    Return the shared httpx connection pool used by every Azure OpenAI client.
+    
+    Sharing the pool keeps TCP+TLS connections alive across calls instead of
+    handshaking per request. Created lazily so that each gunicorn worker
+    builds its own pool after fork.
+    """
+    global _HTTP_CLIENT
+    
+    if _HTTP_CLIENT is None:
+        with _HTTP_CLIENT_LOCK:
+            if _HTTP_CLIENT is None:
+                _HTTP_CLIENT = httpx.Client(
+                    limits=httpx.Limits(max_connections=100, max_keepalive_connections=50)
+                )
+    
+    return _HTTP_CLIENT
+
+
+def configure(**settings) -> None:
+    """
+    Override Azure OpenAI settings read from the environment at import.
+    
+    Args:
+        **settings: Any of api_key, endpoint, deployment_name, api_version,
+            batch_deployment_name, batch_api_version, embedding_deployment_name
+    
+    Example:
+        >>> configure(endpoint="https://other-resource.openai.azure.com/")
+    """
+    global _CONFIG, _DEFAULT_CLIENT, _SEMANTIC_CACHE, _SEMANTIC_CACHE_CHECKED
+    
+    with _CLIENT_LOCK:
+        _CONFIG = replace(_CONFIG, **settings)
+        _DEFAULT_CLIENT = None
+        _SEMANTIC_CACHE = None
+        _SEMANTIC_CACHE_CHECKED = False
+        # Clients are built from the config (e.g. api_version), so rebuild them
+        _get_validated_client.cache_clear()
+
+
+@lru_cache(maxsize=8)
+def _cached_openai_client(api_key: str, endpoint: str, api_version: str) -> AzureOpenAI:
+    """Build one AzureOpenAI client per distinct configuration."""
+    return AzureOpenAI(
+        api_key=api_key,
+        api_version=api_version,
+        azure_endpoint=endpoint,
+        http_client=get_http_client(),
+        max_retries=0  # retried by _with_retries
+    )
+
 
 def get_openai_client(
     api_key: Optional[str] = None,
@@ -23,7 +363,12 @@ def get_openai_client(
     api_version: Optional[str] = None
 ) -> AzureOpenAI:
     """
-    Create and return an Azure OpenAI client.
+    Return a shared Azure OpenAI client.
+    
+    Clients are cached per (api_key, endpoint, api_version), so repeated calls
+    reuse one client and its keep-alive connection pool. A client is safe to
+    share between threads but not across fork() (openai-python #820): it is
+    only ever created lazily, inside the process that uses it.
     
     Args:
         api_key: Optional API key (defaults to env variable)
@@ -33,11 +378,186 @@ def get_openai_client(
     Returns:
         AzureOpenAI client instance
     """
-    return AzureOpenAI(
-        api_key=api_key or os.getenv("AZURE_OPENAI_API_KEY"),
-        api_version=api_version or os.getenv("AZURE_OPENAI_API_VERSION", "2024-02-15-preview"),
-        azure_endpoint=endpoint or os.getenv("AZURE_OPENAI_ENDPOINT")
+    global _DEFAULT_CLIENT
+    
+    if api_key is None and endpoint is None and api_version is None and _DEFAULT_CLIENT is not None:
+        return _DEFAULT_CLIENT
+    
+    resolved = (
+        api_key or _CONFIG.api_key,
+        endpoint or _CONFIG.endpoint,
+        api_version or _CONFIG.api_version
+    )
+    
+    with _CLIENT_LOCK:
+        client = _cached_openai_client(*resolved)
+        if api_key is None and endpoint is None and api_version is None:
+            _DEFAULT_CLIENT = client
+    
+    return client
+
+
+def get_async_openai_client(
+    api_key: Optional[str] = None,
+    endpoint: Optional[str] = None,
+    api_version: Optional[str] = None
+) -> AsyncAzureOpenAI:
+    """
+    Return an async Azure OpenAI client for the running event loop.
+    
+    Async connection pools belong to the loop that opened them, so clients
+    are cached per (event loop, configuration) rather than process-wide.
+    Must be called from inside a coroutine.
+    
+    Args:
+        api_key: Optional API key (defaults to env variable)
+        endpoint: Optional endpoint (defaults to env variable)
+        api_version: Optional API version (defaults to env variable)
+    
+    Returns:
+        AsyncAzureOpenAI client instance
+    """
+    loop = asyncio.get_running_loop()
+    resolved = (
+        api_key or _CONFIG.api_key,
+        endpoint or _CONFIG.endpoint,
+        api_version or _CONFIG.api_version
     )
+    
+    with _CLIENT_LOCK:
+        clients = _ASYNC_CLIENTS.setdefault(loop, {})
+        client = clients.get(resolved)
+        if client is None:
+            client = clients[resolved] = AsyncAzureOpenAI(
+                api_key=resolved[0],
+                azure_endpoint=resolved[1],
+                api_version=resolved[2],
+                max_retries=0  # retried by _with_retries
+            )
+    
+    return client
+
+
+def _task_system_message(role: str, instruction: str) -> str:
+    """
+    System prompt for a fixed task (e.g. a summary style): the role, then
+    the instruction.
+    
+    Built once per task at import, so it is byte-identical across calls and
+    forms a stable prefix for server-side prompt caching; everything that
+    varies goes in the user message. Never interpolate per-request values
+    (dates, IDs) here.
+    """
+    return f"{role}\n\n{instruction}"
+
+
+# System prompts per summary style and explanation audience
+_SUMMARY_SYSTEM_MESSAGES = {
+    style: _task_system_message("You are an expert summarizer. Create clear and accurate summaries.", instruction)
+    for style, instruction in {
+        "concise": "Provide a brief, concise summary of the user's text in 2-3 sentences.",
+        "detailed": "Provide a comprehensive summary of the user's text, covering all key points.",
+        "bullet_points": "Summarize the user's text as bullet points highlighting the key information."
+    }.items()
+}
+_DEFAULT_SUMMARY_SYSTEM_MESSAGE = _SUMMARY_SYSTEM_MESSAGES["concise"]
+
+_EXPLAIN_SYSTEM_MESSAGES = {
+    audience: _task_system_message("You are a skilled teacher who explains complex topics clearly.", instruction)
+    for audience, instruction in {
+        "general": "Explain the user's text in simple, everyday language.",
+        "technical": "Provide a technical explanation of the user's text.",
+        "beginner": "Explain the user's text as if teaching a complete beginner."
+    }.items()
+}
+_DEFAULT_EXPLAIN_SYSTEM_MESSAGE = _EXPLAIN_SYSTEM_MESSAGES["general"]
+
+
+@lru_cache(maxsize=8)
+def _validate_config(api_key: Optional[str], endpoint: Optional[str]) -> None:
+    """
+    Check credentials and the endpoint URL, raising ValueError with a
+    configuration message when they are unusable.
+    
+    Successful checks are memoized (failures are not), so the endpoint is
+    parsed once per value rather than on every call.
+    """
+    if not api_key:
+        raise ValueError("Missing AZURE_OPENAI_API_KEY. Please set it in .env file.")
+    
+    if not endpoint:
+        raise ValueError("Missing AZURE_OPENAI_ENDPOINT. Please set it in .env file.")
+    
+    parts = urlsplit(endpoint)
+    if parts.scheme not in ("http", "https") or not parts.netloc:
+        raise ValueError(f"Invalid AZURE_OPENAI_ENDPOINT: {endpoint!r}. Expected https://<resource>.openai.azure.com/")
+
+
+@lru_cache(maxsize=8)
+def _get_validated_client(api_key: Optional[str], endpoint: Optional[str]) -> AzureOpenAI:
+    """
+    Validate the configuration and return its shared client; both happen
+    once per (api_key, endpoint), after which a call is a cache lookup.
+    
+    Raises:
+        ValueError: if the configuration is missing or malformed
+    """
+    _validate_config(api_key, endpoint)
+    return get_openai_client(api_key, endpoint)
+
+
+@lru_cache(maxsize=64)
+def _system_entry(content: str) -> Dict[str, str]:
+    """The system message dict for content, shared between calls (never mutated)."""
+    return {"role": "system", "content": content}
+
+
+def _build_messages(prompt: str, system_message: Optional[str] = None) -> List[Dict[str, str]]:
+    """Build the chat messages for a prompt, with a default system message."""
+    return [
+        _system_entry(system_message or "You are a helpful AI assistant. Provide clear, concise, and accurate responses."),
+        {"role": "user", "content": prompt}
+    ]
+
+
+def _semantic_lookup(cache: Optional[SemanticResponseCache], client: AzureOpenAI, prompt: str, context: str) -> tuple:
+    """
+    Embed prompt and look it up in the semantic cache (from _semantic_cache).
+    
+    Returns:
+        (unit vector, cached result or None); (None, None) when the semantic
+        cache is off, the prompt is too long for it, or embedding fails
+    """
+    if cache is None or len(prompt) > SEMANTIC_CACHE_MAX_CHARS:
+        return None, None
+    
+    vector = cache.vector_for(prompt)
+    if vector is None:
+        try:
+            response = client.embeddings.create(model=_CONFIG.embedding_deployment_name, input=prompt)
+        except Exception as e:
+            logger.warning("Embedding for semantic cache failed: %s", e)
+            return None, None
+        vector = cache.store_vector(prompt, response.data[0].embedding)
+    
+    return vector, cache.get(context, vector)
+
+
+async def _asemantic_lookup(cache: Optional[SemanticResponseCache], client: AsyncAzureOpenAI, prompt: str, context: str) -> tuple:
+    """Async _semantic_lookup."""
+    if cache is None or len(prompt) > SEMANTIC_CACHE_MAX_CHARS:
+        return None, None
+    
+    vector = cache.vector_for(prompt)
+    if vector is None:
+        try:
+            response = await client.embeddings.create(model=_CONFIG.embedding_deployment_name, input=prompt)
+        except Exception as e:
+            logger.warning("Embedding for semantic cache failed: %s", e)
+            return None, None
+        vector = cache.store_vector(prompt, response.data[0].embedding)
+    
+    return vector, cache.get(context, vector)
 
 
 def generate_ai_response(
@@ -47,7 +567,8 @@ def generate_ai_response(
     max_tokens: int = 1000,
     api_key: Optional[str] = None,
     endpoint: Optional[str] = None,
-    deployment_name: Optional[str] = None
+    deployment_name: Optional[str] = None,
+    on_token: Optional[Callable[[str], None]] = None
 ) -> dict:
     """
     Generate an AI response using Azure OpenAI Chat Completions API.
@@ -55,11 +576,18 @@ def generate_ai_response(
     Args:
         prompt: The user prompt/question to send to the model
         system_message: Optional system message to set context
-        temperature: Controls randomness (0-1, default 0.7)
+        temperature: Controls randomness (0-1, default 0.7); results of
+            calls at 0.3 or below are cached, and below 0.3 with an
+            embedding deployment configured also reused for near-identical
+            prompts
         max_tokens: Maximum tokens in response (default 1000)
         api_key: Optional API key (defaults to env variable)
         endpoint: Optional endpoint (defaults to env variable)
         deployment_name: Optional deployment name (defaults to env variable)
+        on_token: Optional callback, called with each content delta as it
+            arrives (e.g. for a progress UI). The completion is then
+            streamed; the returned dict is the same, though usage counts are
+            None on API versions older than STREAM_USAGE_API_VERSION.
     
     Returns:
         dict containing:
@@ -75,146 +603,704 @@ def generate_ai_response(
     """
     
     # Get configuration from environment or parameters
-    api_key = api_key or os.getenv("AZURE_OPENAI_API_KEY")
-    endpoint = endpoint or os.getenv("AZURE_OPENAI_ENDPOINT")
-    deployment_name = deployment_name or os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME", "gpt-4o-mini")
+    api_key = api_key or _CONFIG.api_key
+    endpoint = endpoint or _CONFIG.endpoint
+    deployment_name = deployment_name or _CONFIG.deployment_name
     
-    # Validate configuration
-    if not api_key:
-        return {
-            "success": False,
-            "error": "Missing AZURE_OPENAI_API_KEY. Please set it in .env file.",
-            "prompt": prompt,
-            "response": None,
-            "usage": None
-        }
+    # Validate configuration (once per api_key/endpoint pair) and get the shared client
+    try:
+        client = _get_validated_client(api_key, endpoint)
+    except ValueError as e:
+        return _err(prompt, str(e))
     
-    if not endpoint:
-        return {
-            "success": False,
-            "error": "Missing AZURE_OPENAI_ENDPOINT. Please set it in .env file.",
-            "prompt": prompt,
-            "response": None,
-            "usage": None
-        }
+    # Identical low-temperature requests are served from the response cache
+    cache_key = None
+    if temperature <= LLMResponseCache.MAX_TEMPERATURE:
+        cache_key = LLMResponseCache.make_key(prompt, system_message, deployment_name, temperature, max_tokens)
+        cached = _RESPONSE_CACHE.get(cache_key)
+        if cached is not None:
+            if on_token is not None:
+                on_token(cached["response"])
+            return cached
     
     try:
-        # Create client
-        client = get_openai_client(api_key, endpoint)
+        # ...and near-identical ones from the semantic cache, when enabled
+        semantic = vector = context = None
+        if cache_key is not None and temperature < SEMANTIC_CACHE_MAX_TEMPERATURE:
+            semantic = _semantic_cache()
+            context = LLMResponseCache.make_key("", system_message, deployment_name, temperature, max_tokens)
+            vector, cached = _semantic_lookup(semantic, client, prompt, context)
+            if cached is not None:
+                cached["prompt"] = prompt
+                _RESPONSE_CACHE.set(cache_key, cached)
+                if on_token is not None:
+                    on_token(cached["response"])
+                return cached
         
-        # Build messages
-        messages: List[Dict[str, str]] = []
+        # Make the API call
+        request = {
+            "model": deployment_name,
+            "messages": _build_messages(prompt, system_message),
+            "temperature": temperature,
+            "max_tokens": max_tokens
+        }
         
-        if system_message:
-            messages.append({"role": "system", "content": system_message})
+        if on_token is None:
+            response = _create_completion(client, **request)
+            result = _completion_result(prompt, response, deployment_name)
         else:
-            messages.append({
-                "role": "system",
-                "content": "You are a helpful AI assistant. Provide clear, concise, and accurate responses."
-            })
+            result = _streamed_completion_result(prompt, client, request, on_token, deployment_name)
         
-        messages.append({"role": "user", "content": prompt})
+        if cache_key is not None:
+            _RESPONSE_CACHE.set(cache_key, result)
+            if vector is not None:
+                semantic.set(context, vector, result)
         
-        # Make the API call
-        response = client.chat.completions.create(
+        return result
+        
+    except Exception as e:
+        return _error_result(prompt, e)
+
+
+def _completion_result(prompt: str, response, deployment_name: str) -> dict:
+    """Build the success result dict from a chat completion."""
+    return {
+        "success": True,
+        "prompt": prompt,
+        "response": response.choices[0].message.content,
+        "usage": {
+            "prompt_tokens": response.usage.prompt_tokens,
+            "completion_tokens": response.usage.completion_tokens,
+            "total_tokens": response.usage.total_tokens
+        },
+        "model": deployment_name,
+        "error": None
+    }
+
+
+def _streamed_completion_result(
+    prompt: str,
+    client: AzureOpenAI,
+    request: dict,
+    on_token: Callable[[str], None],
+    deployment_name: str
+) -> dict:
+    """Stream a chat completion, passing deltas to on_token, and build the usual result dict."""
+    if _CONFIG.api_version[:10] >= STREAM_USAGE_API_VERSION[:10]:
+        request["stream_options"] = {"include_usage": True}
+    
+    parts = []
+    usage = None
+    
+    for chunk in _create_completion(client, stream=True, **request):
+        # Azure sends a leading chunk with no choices (content filter results);
+        # with include_usage the final chunk has no choices either, only usage
+        if chunk.choices and chunk.choices[0].delta.content:
+            parts.append(chunk.choices[0].delta.content)
+            on_token(chunk.choices[0].delta.content)
+        if getattr(chunk, "usage", None):
+            usage = chunk.usage
+    
+    return {
+        "success": True,
+        "prompt": prompt,
+        "response": "".join(parts),
+        "usage": {
+            "prompt_tokens": usage.prompt_tokens if usage else None,
+            "completion_tokens": usage.completion_tokens if usage else None,
+            "total_tokens": usage.total_tokens if usage else None
+        },
+        "model": deployment_name,
+        "error": None
+    }
+
+
+# Fields of every failed generate_ai_response result
+_ERROR_TEMPLATE = {"success": False, "error": None, "prompt": None, "response": None, "usage": None}
+
+
+def _err(prompt: Optional[str], error: str, **extra) -> dict:
+    """Build a failure result dict for generate_ai_response and friends."""
+    return {**_ERROR_TEMPLATE, "error": error, "prompt": prompt, **extra}
+
+
+def _error_result(prompt: str, e: BaseException) -> dict:
+    """Build the failure result dict for an exception from the API call."""
+    # Prefer the service's own message over the SDK's "Error code: ..." wrapper
+    if isinstance(e, openai.APIStatusError) and isinstance(e.body, dict) and e.body.get("message"):
+        error_message = e.body["message"]
+    elif isinstance(e, openai.APIError):
+        error_message = e.message
+    else:
+        error_message = str(e)
+    
+    return _err(prompt, f"OpenAI API Error: {error_message}")
+
+
+async def agenerate_ai_response(
+    prompt: str,
+    system_message: Optional[str] = None,
+    temperature: float = 0.7,
+    max_tokens: int = 1000,
+    api_key: Optional[str] = None,
+    endpoint: Optional[str] = None,
+    deployment_name: Optional[str] = None
+) -> dict:
+    """
+    Async version of generate_ai_response; same arguments and result dict.
+    
+    Example:
+        >>> result = await agenerate_ai_response("Summarize the benefits of AI")
+    """
+    
+    # Get configuration from environment or parameters
+    api_key = api_key or _CONFIG.api_key
+    endpoint = endpoint or _CONFIG.endpoint
+    deployment_name = deployment_name or _CONFIG.deployment_name
+    
+    # Validate configuration
+    try:
+        _validate_config(api_key, endpoint)
+    except ValueError as e:
+        return _err(prompt, str(e))
+    
+    cache_key = None
+    if temperature <= LLMResponseCache.MAX_TEMPERATURE:
+        cache_key = LLMResponseCache.make_key(prompt, system_message, deployment_name, temperature, max_tokens)
+        cached = _RESPONSE_CACHE.get(cache_key)
+        if cached is not None:
+            return cached
+    
+    try:
+        client = get_async_openai_client(api_key, endpoint)
+        
+        semantic = vector = context = None
+        if cache_key is not None and temperature < SEMANTIC_CACHE_MAX_TEMPERATURE:
+            semantic = _semantic_cache()
+            context = LLMResponseCache.make_key("", system_message, deployment_name, temperature, max_tokens)
+            vector, cached = await _asemantic_lookup(semantic, client, prompt, context)
+            if cached is not None:
+                cached["prompt"] = prompt
+                _RESPONSE_CACHE.set(cache_key, cached)
+                return cached
+        
+        response = await _acreate_completion(
+            client,
             model=deployment_name,
-            messages=messages,
+            messages=_build_messages(prompt, system_message),
             temperature=temperature,
             max_tokens=max_tokens
         )
         
-        # Extract response
-        response_text = response.choices[0].message.content
+        result = _completion_result(prompt, response, deployment_name)
         
-        # Extract usage statistics
-        usage = {
-            "prompt_tokens": response.usage.prompt_tokens,
-            "completion_tokens": response.usage.completion_tokens,
-            "total_tokens": response.usage.total_tokens
+        if cache_key is not None:
+            _RESPONSE_CACHE.set(cache_key, result)
+            if vector is not None:
+                semantic.set(context, vector, result)
+        
+        return result
+        
+    except Exception as e:
+        return _error_result(prompt, e)
+
+
+async def generate_many(
+    prompts: List[Union[str, dict]],
+    concurrency: int = 10,
+    **kwargs
+) -> List[dict]:
+    """
+    Generate responses for many prompts concurrently.
+    
+    Wall-clock time is roughly that of the slowest batch of `concurrency`
+    requests instead of the sum of all round-trips.
+    
+    Args:
+        prompts: Prompt strings, or dicts of agenerate_ai_response arguments
+            (e.g. {"prompt": ..., "system_message": ...})
+        concurrency: Maximum requests in flight at once (default 10)
+        **kwargs: Default arguments for every agenerate_ai_response call
+    
+    Returns:
+        List of result dicts, in the same order as prompts
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def run(item):
+        call_kwargs = dict(kwargs, **item) if isinstance(item, dict) else dict(kwargs, prompt=item)
+        async with semaphore:
+            return await agenerate_ai_response(**call_kwargs)
+    
+    results = await asyncio.gather(*(run(item) for item in prompts), return_exceptions=True)
+    
+    return [
+        _error_result(item.get("prompt") if isinstance(item, dict) else item, result)
+        if isinstance(result, BaseException) else result
+        for item, result in zip(prompts, results)
+    ]
+
+
+def generate_many_sync(
+    prompts: List[Union[str, dict]],
+    concurrency: int = 10,
+    **kwargs
+) -> List[dict]:
+    """
+    Synchronous counterpart of generate_many; same arguments and results.
+    
+    Runs generate_ai_response on a thread pool, so the calls share the sync
+    client's connection pool (get_http_client) instead of handshaking on a
+    throwaway event loop. Safe to call from inside a running event loop.
+    """
+    if not prompts:
+        return []
+    
+    def run(item):
+        call_kwargs = dict(kwargs, **item) if isinstance(item, dict) else dict(kwargs, prompt=item)
+        try:
+            return generate_ai_response(**call_kwargs)
+        except Exception as e:
+            return _error_result(call_kwargs.get("prompt"), e)
+    
+    # map() keeps results in input order
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(prompts))) as pool:
+        return list(pool.map(run, prompts))
+
+
+def generate_ai_response_stream(
+    prompt: str,
+    system_message: Optional[str] = None,
+    temperature: float = 0.7,
+    max_tokens: int = 1000,
+    api_key: Optional[str] = None,
+    endpoint: Optional[str] = None,
+    deployment_name: Optional[str] = None
+) -> Iterator[str]:
+    """
+    Stream an AI response, yielding content deltas as the model generates them.
+    
+    Takes the same arguments as generate_ai_response. Unlike it, errors are
+    raised rather than returned (ValueError for missing configuration, the
+    OpenAI SDK's exceptions for API failures), and no usage statistics are
+    available.
+    
+    Example:
+        >>> for delta in generate_ai_response_stream("Tell me a story"):
+        ...     print(delta, end="")
+    """
+    
+    # Get configuration from environment or parameters
+    api_key = api_key or _CONFIG.api_key
+    endpoint = endpoint or _CONFIG.endpoint
+    deployment_name = deployment_name or _CONFIG.deployment_name
+    
+    client = _get_validated_client(api_key, endpoint)
+    
+    stream = _create_completion(
+        client,
+        model=deployment_name,
+        messages=_build_messages(prompt, system_message),
+        temperature=temperature,
+        max_tokens=max_tokens,
+        stream=True
+    )
+    
+    for chunk in stream:
+        # Azure sends a leading chunk with no choices (content filter results)
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
+
+
+def _batch_config(api_key, endpoint, deployment_name):
+    """Resolve credentials and the (global-batch) deployment for Batch API calls."""
+    return (
+        api_key or _CONFIG.api_key,
+        endpoint or _CONFIG.endpoint,
+        deployment_name or _CONFIG.batch_deployment_name
+    )
+
+
+def _batch_client(api_key: str, endpoint: str) -> AzureOpenAI:
+    """Client pinned to an API version that has the Batch API."""
+    return get_openai_client(api_key, endpoint, _CONFIG.batch_api_version)
+
+
+def submit_batch(
+    prompts: List[dict],
+    api_key: Optional[str] = None,
+    endpoint: Optional[str] = None,
+    deployment_name: Optional[str] = None
+) -> dict:
+    """
+    Submit many chat completions as one asynchronous Azure OpenAI batch job.
+    
+    Batches cost about half the real-time rate and don't consume the
+    deployment's real-time quota, but complete within 24 hours rather than
+    seconds. Use for bulk offline work; poll with poll_batch and collect
+    with fetch_batch_results.
+    
+    Args:
+        prompts: dicts with "prompt" and optional "system_message",
+            "temperature", "max_tokens" and "custom_id" (default "request-N")
+        api_key: Optional API key (defaults to env variable)
+        endpoint: Optional endpoint (defaults to env variable)
+        deployment_name: Optional global-batch deployment (defaults to
+            AZURE_OPENAI_BATCH_DEPLOYMENT_NAME, then AZURE_OPENAI_DEPLOYMENT_NAME)
+    
+    Returns:
+        dict with batch_id, status and request_count, or error
+    """
+    api_key, endpoint, deployment_name = _batch_config(api_key, endpoint, deployment_name)
+    
+    if not api_key or not endpoint:
+        return {"success": False, "error": "Missing OpenAI credentials", "batch_id": None}
+    
+    if not prompts:
+        return {"success": False, "error": "No prompts provided", "batch_id": None}
+    
+    lines = []
+    for i, item in enumerate(prompts):
+        lines.append(json.dumps({
+            "custom_id": item.get("custom_id", f"request-{i}"),
+            "method": "POST",
+            "url": "/chat/completions",
+            "body": {
+                "model": deployment_name,
+                "messages": _build_messages(item["prompt"], item.get("system_message")),
+                "temperature": item.get("temperature", 0.7),
+                "max_tokens": item.get("max_tokens", 1000)
+            }
+        }))
+    
+    try:
+        client = _batch_client(api_key, endpoint)
+        
+        input_file = client.files.create(
+            file=("batch.jsonl", "\n".join(lines).encode('utf-8')),
+            purpose="batch"
+        )
+        batch = client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/chat/completions",
+            completion_window="24h"
+        )
+        
+        return {
+            "success": True,
+            "batch_id": batch.id,
+            "status": batch.status,
+            "request_count": len(lines),
+            "error": None
         }
         
+    except Exception as e:
+        return {"success": False, "error": f"Batch submission failed: {str(e)}", "batch_id": None}
+
+
+def poll_batch(batch_id: str, api_key: Optional[str] = None, endpoint: Optional[str] = None) -> dict:
+    """
+    Get the status of a submitted batch.
+    
+    Returns:
+        dict with status ("validating", "in_progress", "completed", "failed",
+        "expired", "cancelled", ...) and completed/failed/total request counts
+    """
+    api_key, endpoint, _ = _batch_config(api_key, endpoint, None)
+    
+    try:
+        batch = _batch_client(api_key, endpoint).batches.retrieve(batch_id)
+        counts = batch.request_counts
+        
         return {
             "success": True,
-            "prompt": prompt,
-            "response": response_text,
-            "usage": usage,
-            "model": deployment_name,
+            "batch_id": batch.id,
+            "status": batch.status,
+            "request_counts": {
+                "completed": counts.completed if counts else 0,
+                "failed": counts.failed if counts else 0,
+                "total": counts.total if counts else 0
+            },
             "error": None
         }
         
     except Exception as e:
-        error_message = str(e)
+        return {"success": False, "error": f"Batch status check failed: {str(e)}", "batch_id": batch_id}
+
+
+def fetch_batch_results(batch_id: str, api_key: Optional[str] = None, endpoint: Optional[str] = None) -> dict:
+    """
+    Download the results of a completed batch.
+    
+    Returns:
+        dict with "results": {custom_id: {success, response, usage, error}}
+    """
+    api_key, endpoint, _ = _batch_config(api_key, endpoint, None)
+    
+    try:
+        client = _batch_client(api_key, endpoint)
+        batch = client.batches.retrieve(batch_id)
         
-        # Extract more details if available
-        if hasattr(e, 'message'):
-            error_message = e.message
-        elif hasattr(e, 'body') and e.body:
-            if isinstance(e.body, dict) and 'message' in e.body:
-                error_message = e.body['message']
+        if batch.status != "completed":
+            return {"success": False, "error": f"Batch is not completed (status: {batch.status})", "results": None}
         
-        return {
-            "success": False,
-            "error": f"OpenAI API Error: {error_message}",
-            "prompt": prompt,
-            "response": None,
-            "usage": None
+        results = {}
+        
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            for line in client.files.content(file_id).text.splitlines():
+                if not line.strip():
+                    continue
+                item = json.loads(line)
+                response = item.get("response") or {}
+                body = response.get("body") or {}
+                
+                if response.get("status_code") == 200 and body.get("choices"):
+                    results[item["custom_id"]] = {
+                        "success": True,
+                        "response": body["choices"][0]["message"]["content"],
+                        "usage": body.get("usage"),
+                        "error": None
+                    }
+                else:
+                    error = item.get("error") or body.get("error") or {}
+                    results[item["custom_id"]] = {
+                        "success": False,
+                        "response": None,
+                        "usage": None,
+                        "error": f"OpenAI API Error: {error.get('message', 'request failed')}"
+                    }
+        
+        return {"success": True, "batch_id": batch_id, "results": results, "error": None}
+        
+    except Exception as e:
+        return {"success": False, "error": f"Fetching batch results failed: {str(e)}", "results": None}
+
+
+def _submit_text_batch(
+    texts: Union[str, List[str]],
+    system_message: str,
+    temperature: float = 0.7,
+    max_tokens: int = 1000,
+    **kwargs
+) -> dict:
+    """Submit one request per text, sharing a system prompt, as one batch (custom_id "text-N")."""
+    if isinstance(texts, str):
+        texts = [texts]
+    
+    prompts = [
+        {
+            "custom_id": f"text-{i}",
+            "prompt": text,
+            "system_message": system_message,
+            "temperature": temperature,
+            "max_tokens": max_tokens
         }
+        for i, text in enumerate(texts)
+    ]
+    return submit_batch(prompts, **kwargs)
+
+
+@lru_cache(maxsize=1)
+def _token_encoding():
+    """tiktoken encoding of the gpt-4o model family, or None when tiktoken is unavailable."""
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("o200k_base")
+    except Exception:  # not installed, or its vocabulary file can't be fetched
+        return None
+
+
+def _count_tokens(text: str) -> int:
+    """
+    Token count of text. Without tiktoken it is estimated: 4 characters per
+    token for Latin text, rising to a token per character for scripts that
+    take 3 bytes in UTF-8 (Devanagari, CJK, ...), which tokenize far denser.
+    """
+    encoding = _token_encoding()
+    
+    if encoding is None:
+        return max(len(text) // 4, (len(text.encode('utf-8')) - len(text)) // 2)
+    
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def _is_long(text: str) -> bool:
+    """Whether text is over LONG_TEXT_TOKENS (a token is at least a character, so short texts aren't encoded)."""
+    return len(text) > LONG_TEXT_TOKENS and _count_tokens(text) > LONG_TEXT_TOKENS
+
+
+def _chunk(text: str, max_tokens: int = LONG_TEXT_TOKENS) -> List[str]:
+    """Split text at paragraph/sentence boundaries into chunks of about max_tokens tokens."""
+    chunks = []
+    
+    for chunk in split_text_chunks(text, max_tokens * 4):
+        tokens = _count_tokens(chunk)
+        if tokens > max_tokens:
+            # Denser than 4 characters per token (e.g. CJK, code): split again, proportionally smaller
+            chunks.extend(split_text_chunks(chunk, len(chunk) * max_tokens // tokens))
+        else:
+            chunks.append(chunk)
+    
+    return chunks
+
+
+@lru_cache(maxsize=16)
+def _combine_system_message(system_message: str) -> str:
+    """System prompt for merging partial results of system_message's task (stable per task)."""
+    return (
+        f"{system_message}\n\n"
+        "The user's text consists of results for consecutive parts of one long text, "
+        "separated by blank lines. Combine them into a single response."
+    )
+
+
+def _map_reduce(text: str, system_message: str, **kwargs) -> dict:
+    """
+    Run system_message's task over a long text: every chunk concurrently
+    (generate_many_sync), then one call combining the partial results. Partial
+    results that are still too long are combined chunk-wise first, so a
+    document of N chunks takes about log(N) rounds. Gives up with an error
+    result when a round doesn't shrink the text (e.g. max_tokens too high
+    for the chunk size) or after MAX_REDUCE_ROUNDS rounds.
+    
+    Args:
+        text: The long text
+        system_message: System prompt of the task (e.g. a summary style)
+        **kwargs: Additional arguments passed to generate_ai_response
+    
+    Returns:
+        generate_ai_response's dict for the final call, with the original
+        text as prompt, token usage summed over all calls and
+        chunks_processed set
+    """
+    on_token = kwargs.pop("on_token", None)
+    prompt = text
+    results = []
+    chunks_processed = None
+    step_message = system_message
+    rounds = 0
+    
+    while _is_long(text):
+        if rounds == MAX_REDUCE_ROUNDS:
+            return _err(prompt, f"Text is still too long after {MAX_REDUCE_ROUNDS} rounds of combining partial results")
+        
+        chunks = _chunk(text)
+        chunks_processed = chunks_processed or len(chunks)
+        
+        partials = generate_many_sync(
+            [{"prompt": chunk, "system_message": step_message} for chunk in chunks],
+            concurrency=MAX_CONCURRENT_REQUESTS,
+            **kwargs
+        )
+        
+        for i, result in enumerate(partials):
+            if not result["success"]:
+                return dict(result, prompt=prompt, error=f"Failed at chunk {i+1}: {result['error']}")
+        
+        results.extend(partials)
+        combined = "\n\n".join(result["response"] for result in partials)
+        
+        # Partial results at least as long as their input would never converge
+        if len(combined) >= len(text):
+            return _err(prompt, "Partial results are not shorter than the text; lower max_tokens or use a shorter style")
+        
+        text = combined
+        step_message = _combine_system_message(system_message)
+        rounds += 1
+    
+    final = generate_ai_response(text, system_message=step_message, on_token=on_token, **kwargs)
+    
+    if not final["success"]:
+        return dict(final, prompt=prompt)
+    
+    results.append(final)
+    
+    return dict(
+        final,
+        prompt=prompt,
+        usage={
+            key: sum(result["usage"][key] or 0 for result in results)
+            for key in ("prompt_tokens", "completion_tokens", "total_tokens")
+        },
+        chunks_processed=chunks_processed or 1
+    )
 
 
 def summarize_text(
-    text: str,
+    text: Union[str, List[str]],
     style: str = "concise",
+    stream: bool = False,
+    mode: str = "realtime",
     **kwargs
-) -> dict:
+):
     """
     Summarize text using Azure OpenAI.
     
+    Texts over LONG_TEXT_TOKENS are summarized in chunks, concurrently, and
+    the partial summaries combined (not when streaming).
+    
     Args:
-        text: The text to summarize
+        text: The text to summarize (or, in batch mode, a list of texts)
         style: Summary style - "concise", "detailed", or "bullet_points"
+        stream: If True, return an iterator of summary deltas instead
+            (see generate_ai_response_stream)
+        mode: "realtime" (default), or "batch" to submit through the Batch
+            API and return submit_batch's result (custom_ids "text-N")
         **kwargs: Additional arguments passed to generate_ai_response
+            (e.g. temperature=0.3 or lower to have results cached)
     
     Returns:
-        dict with summary response
+        dict with summary response, or an iterator of str when streaming
     """
-    style_prompts = {
-        "concise": "Provide a brief, concise summary of the following text in 2-3 sentences:",
-        "detailed": "Provide a comprehensive summary of the following text, covering all key points:",
-        "bullet_points": "Summarize the following text as bullet points highlighting the key information:"
-    }
+    # Instruction lives in the (stable) system prompt; the user message is just the text
+    system_message = _SUMMARY_SYSTEM_MESSAGES.get(style, _DEFAULT_SUMMARY_SYSTEM_MESSAGE)
     
-    system_message = "You are an expert summarizer. Create clear and accurate summaries."
-    prompt = f"{style_prompts.get(style, style_prompts['concise'])}\n\n{text}"
+    if mode == "batch":
+        return _submit_text_batch(text, system_message, **kwargs)
     
-    return generate_ai_response(prompt, system_message=system_message, **kwargs)
+    if stream:
+        return generate_ai_response_stream(text, system_message=system_message, **kwargs)
+    
+    if _is_long(text):
+        return _map_reduce(text, system_message, **kwargs)
+    
+    return generate_ai_response(text, system_message=system_message, **kwargs)
 
 
 def explain_text(
-    text: str,
+    text: Union[str, List[str]],
     audience: str = "general",
+    mode: str = "realtime",
     **kwargs
 ) -> dict:
     """
     Explain or simplify text using Azure OpenAI.
     
+    Texts over LONG_TEXT_TOKENS are explained in chunks, concurrently, and
+    the partial explanations combined.
+    
     Args:
-        text: The text to explain
+        text: The text to explain (or, in batch mode, a list of texts)
         audience: Target audience - "general", "technical", or "beginner"
+        mode: "realtime" (default), or "batch" to submit through the Batch
+            API and return submit_batch's result (custom_ids "text-N")
         **kwargs: Additional arguments passed to generate_ai_response
+            (e.g. temperature=0.3 or lower to have results cached)
     
     Returns:
         dict with explanation response
     """
-    audience_prompts = {
-        "general": "Explain the following in simple, everyday language:",
-        "technical": "Provide a technical explanation of the following:",
-        "beginner": "Explain the following as if teaching a complete beginner:"
-    }
+    system_message = _EXPLAIN_SYSTEM_MESSAGES.get(audience, _DEFAULT_EXPLAIN_SYSTEM_MESSAGE)
+    
+    if mode == "batch":
+        return _submit_text_batch(text, system_message, **kwargs)
     
-    system_message = "You are a skilled teacher who explains complex topics clearly."
-    prompt = f"{audience_prompts.get(audience, audience_prompts['general'])}\n\n{text}"
+    if _is_long(text):
+        return _map_reduce(text, system_message, **kwargs)
     
-    return generate_ai_response(prompt, system_message=system_message, **kwargs)
+    return generate_ai_response(text, system_message=system_message, **kwargs)
 
 
 def extract_text_from_image(image_bytes: bytes, mime_type: str = "image/png") -> dict:
@@ -235,9 +1321,9 @@ def extract_text_from_image(image_bytes: bytes, mime_type: str = "image/png") ->
         b64_img = base64.b64encode(image_bytes).decode('utf-8')
         data_url = f"data:{mime_type};base64,{b64_img}"
         
-        api_key = os.getenv("AZURE_OPENAI_API_KEY")
-        endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
-        deployment_name = os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME", "gpt-4o-mini")
+        api_key = _CONFIG.api_key
+        endpoint = _CONFIG.endpoint
+        deployment_name = _CONFIG.deployment_name
         
         if not api_key or not endpoint:
             return {"success": False, "error": "Missing OpenAI credentials"}
@@ -258,7 +1344,8 @@ def extract_text_from_image(image_bytes: bytes, mime_type: str = "image/png") ->
             }
         ]
         
-        response = client.chat.completions.create(
+        response = _create_completion(
+            client,
             model=deployment_name,
             messages=messages,
             temperature=0.0,
@@ -0,0 +1,187 @@
+"""
+Tests for the Flask routes in app.py, with the Azure calls mocked out.
+
+Run with: python -m unittest test_app
+"""
+import io
+import unittest
+from unittest import mock
+
+import app as app_module
+import document_processor
+import jobs
+
+try:
+    import fakeredis
+    from rq import Queue, SimpleWorker
+except ImportError:  # queued-path tests need: pip install fakeredis rq
+    fakeredis = None
+
+
+class AppTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.client = app_module.app.test_client()
+
+
+class LanguagesTest(AppTestCase):
+
+    LANGUAGES = {"success": True, "languages": {"fr": {"name": "French"}, "hi": {"name": "Hindi"}}}
+    
+    def setUp(self):
+        super().setUp()
+        app_module._cached_languages.cache_clear()
+        self.addCleanup(app_module._cached_languages.cache_clear)
+        patch = mock.patch.object(app_module, "get_supported_languages", return_value=self.LANGUAGES)
+        self.fetch = patch.start()
+        self.addCleanup(patch.stop)
+    
+    def test_returns_simplified_list_with_etag(self):
+        response = self.client.get("/languages")
+    
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["languages"], {"fr": "French", "hi": "Hindi"})
+        self.assertTrue(response.headers["ETag"])
+        self.assertIn("max-age=86400", response.headers["Cache-Control"])
+    
+    def test_if_none_match_gets_304_without_body(self):
+        etag = self.client.get("/languages").headers["ETag"]
+    
+        response = self.client.get("/languages", headers={"If-None-Match": etag})
+    
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b"")
+        self.assertEqual(self.fetch.call_count, 1)
+    
+    def test_stale_etag_gets_full_response(self):
+        response = self.client.get("/languages", headers={"If-None-Match": '"stale"'})
+    
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["count"], 2)
+    
+    def test_failure_is_not_cached(self):
+        self.fetch.return_value = {"success": False, "error": "unreachable", "languages": {}}
+        self.assertEqual(self.client.get("/languages").status_code, 500)
+    
+        self.fetch.return_value = self.LANGUAGES
+        self.assertEqual(self.client.get("/languages").status_code, 200)
+
+
+
+def _analysis(prompt, **kwargs):
+    return {"success": True, "response": "ANALYSIS", "usage": {"total_tokens": 42}}
+
+
+class AnalyzeTestCase(AppTestCase):
+    """/analyze with OpenAI mocked and extraction in-process; no queue unless a test sets one."""
+    
+    def setUp(self):
+        super().setUp()
+        patches = [
+            mock.patch.object(jobs, "generate_ai_response", side_effect=_analysis),
+            mock.patch.object(document_processor, "EXTRACT_WORKERS", 0),
+            mock.patch.object(jobs, "_QUEUE", None),
+            mock.patch.object(jobs, "_QUEUE_CHECKED", True),
+        ]
+        self.generate = patches[0].start()
+        for patch in patches[1:]:
+            patch.start()
+        for patch in patches:
+            self.addCleanup(patch.stop)
+    
+    def post(self, data=b"Quarterly report text.", filename="report.txt", **form):
+        return self.client.post("/analyze", data={"file": (io.BytesIO(data), filename), **form})
+
+
+class AnalyzeInlineTest(AnalyzeTestCase):
+
+    def test_analyzes_inline_without_a_queue(self):
+        response = self.post(prompt="List the risks")
+    
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json(), {
+            "success": True, "filename": "report.txt", "analysis": "ANALYSIS", "tokens_used": 42
+        })
+        self.assertEqual(self.generate.call_args.args[0], "List the risks\n\nDocument content:\nQuarterly report text.")
+    
+    def test_analysis_failure_is_500(self):
+        self.generate.side_effect = None
+        self.generate.return_value = {"success": False, "error": "OpenAI API Error: quota"}
+    
+        response = self.post()
+    
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(response.get_json()["error"], "OpenAI API Error: quota")
+    
+    def test_rejects_unsupported_file(self):
+        response = self.post(filename="report.exe")
+    
+        self.assertEqual(response.status_code, 400)
+        self.generate.assert_not_called()
+    
+    def test_jobs_are_not_found_without_a_queue(self):
+        self.assertEqual(self.client.get("/jobs/anything").status_code, 404)
+
+
+@unittest.skipIf(fakeredis is None, "fakeredis and rq are not installed")
+class AnalyzeQueuedTest(AnalyzeTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.redis = fakeredis.FakeRedis()
+        self.queue = Queue(jobs.ANALYZE_QUEUE, connection=self.redis)
+        patch = mock.patch.object(jobs, "_QUEUE", self.queue)
+        patch.start()
+        self.addCleanup(patch.stop)
+    
+    def upload_keys(self):
+        return self.redis.keys(f"{jobs.UPLOAD_KEY_PREFIX}*")
+    
+    def run_jobs(self):
+        SimpleWorker([self.queue], connection=self.redis).work(burst=True, logging_level="WARNING")
+    
+    def test_queues_and_returns_202_with_status_url(self):
+        response = self.post()
+    
+        self.assertEqual(response.status_code, 202)
+        body = response.get_json()
+        self.assertEqual(body["status"], "queued")
+        self.assertEqual(body["status_url"], f"/jobs/{body['job_id']}")
+        self.generate.assert_not_called()
+    
+    def test_job_carries_a_key_not_the_upload(self):
+        job_id = self.post(data=b"x" * 10000).get_json()["job_id"]
+    
+        [upload_key] = self.upload_keys()
+        self.assertEqual(self.redis.get(upload_key), b"x" * 10000)
+        self.assertGreater(self.redis.ttl(upload_key), 0)
+        self.assertEqual(self.queue.fetch_job(job_id).args[0], upload_key.decode())
+    
+    def test_poll_until_finished(self):
+        job_id = self.post().get_json()["job_id"]
+        self.assertEqual(self.client.get(f"/jobs/{job_id}").get_json()["status"], "queued")
+    
+        self.run_jobs()
+    
+        body = self.client.get(f"/jobs/{job_id}").get_json()
+        self.assertEqual(body["status"], "finished")
+        self.assertEqual(body["analysis"], "ANALYSIS")
+        self.assertEqual(body["tokens_used"], 42)
+        self.assertEqual(self.upload_keys(), [])
+    
+    def test_expired_upload_fails_the_job_cleanly(self):
+        job_id = self.post().get_json()["job_id"]
+        self.redis.delete(*self.upload_keys())
+    
+        self.run_jobs()
+    
+        body = self.client.get(f"/jobs/{job_id}").get_json()
+        self.assertFalse(body["success"])
+        self.assertIn("expired", body["error"])
+    
+    def test_unknown_job_is_404(self):
+        self.assertEqual(self.client.get("/jobs/no-such-job").status_code, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
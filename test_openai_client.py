@@ -0,0 +1,235 @@
+"""
+Tests for openai_client.py against a mocked Azure OpenAI endpoint (no network).
+
+Run with: python -m unittest test_openai_client
+"""
+import asyncio
+import json
+import unittest
+from dataclasses import replace
+from unittest import mock
+
+import httpx
+
+import openai_client
+from openai_client import LLMResponseCache
+
+
+def _completion(content="ANSWER", total_tokens=15):
+    return httpx.Response(200, json={
+        "id": "chatcmpl-test",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "test-deployment",
+        "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": content}}],
+        "usage": {"prompt_tokens": total_tokens - 5, "completion_tokens": 5, "total_tokens": total_tokens}
+    })
+
+
+class OpenAITestCase(unittest.TestCase):
+    """Points openai_client at a MockTransport; handler(request) answers every call."""
+    
+    def handler(self, request):
+        return _completion()
+    
+    def setUp(self):
+        self.requests = []
+    
+        def record(request):
+            self.requests.append(request)
+            return self.handler(request)
+    
+        patches = [
+            mock.patch.object(openai_client, "_HTTP_CLIENT", httpx.Client(transport=httpx.MockTransport(record))),
+            mock.patch.object(openai_client, "_DEFAULT_CLIENT", None),
+            mock.patch.object(openai_client, "_RESPONSE_CACHE", LLMResponseCache()),
+            mock.patch.object(openai_client, "_SEMANTIC_CACHE", None),
+            mock.patch.object(openai_client, "_SEMANTIC_CACHE_CHECKED", True),
+            mock.patch.object(openai_client, "_CONFIG", replace(
+                openai_client._CONFIG,
+                api_key="test-key",
+                endpoint="https://openai.test/",
+                deployment_name="test-deployment",
+                embedding_deployment_name=None
+            )),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+    
+        for cached in (openai_client._cached_openai_client, openai_client._get_validated_client):
+            cached.cache_clear()
+            self.addCleanup(cached.cache_clear)
+    
+    def request_bodies(self):
+        return [json.loads(request.content) for request in self.requests]
+
+
+class ResponseCacheTest(OpenAITestCase):
+
+    def test_key_covers_every_completion_parameter(self):
+        base = ("prompt", "system", "model", 0.2, 100)
+        key = LLMResponseCache.make_key(*base)
+    
+        self.assertEqual(key, LLMResponseCache.make_key(*base))
+        for i, other in enumerate(("prompt!", "other", "model-2", 0.1, 200)):
+            changed = base[:i] + (other,) + base[i + 1:]
+            self.assertNotEqual(key, LLMResponseCache.make_key(*changed), changed)
+    
+    def test_system_message_none_and_empty_are_distinct(self):
+        self.assertNotEqual(
+            LLMResponseCache.make_key("p", None, "m", 0.0, 10),
+            LLMResponseCache.make_key("p", "", "m", 0.0, 10)
+        )
+    
+    def test_identical_call_at_max_temperature_is_served_from_cache(self):
+        first = openai_client.generate_ai_response("Hello", temperature=LLMResponseCache.MAX_TEMPERATURE)
+        second = openai_client.generate_ai_response("Hello", temperature=LLMResponseCache.MAX_TEMPERATURE)
+    
+        self.assertEqual(len(self.requests), 1)
+        self.assertEqual(second, first)
+        self.assertEqual(openai_client._RESPONSE_CACHE.stats()["hits"], 1)
+    
+    def test_calls_above_max_temperature_are_not_cached(self):
+        openai_client.generate_ai_response("Hello", temperature=0.31)
+        openai_client.generate_ai_response("Hello", temperature=0.31)
+    
+        self.assertEqual(len(self.requests), 2)
+        self.assertEqual(openai_client._RESPONSE_CACHE.stats()["size"], 0)
+    
+    def test_default_temperature_is_not_cached(self):
+        openai_client.generate_ai_response("Hello")
+        openai_client.generate_ai_response("Hello")
+    
+        self.assertEqual(len(self.requests), 2)
+        self.assertEqual(self.request_bodies()[0]["temperature"], 0.7)
+    
+    def test_summaries_keep_the_default_temperature(self):
+        openai_client.summarize_text("Some text.")
+        self.assertEqual(self.request_bodies()[0]["temperature"], 0.7)
+    
+    def test_different_parameters_miss(self):
+        openai_client.generate_ai_response("Hello", temperature=0.0)
+        openai_client.generate_ai_response("Hello", temperature=0.0, max_tokens=50)
+        openai_client.generate_ai_response("Hello", temperature=0.0, system_message="Be brief.")
+    
+        self.assertEqual(len(self.requests), 3)
+    
+    def test_failures_are_not_cached(self):
+        self.handler = lambda request: httpx.Response(400, json={"error": {"message": "bad request"}})
+        failed = openai_client.generate_ai_response("Hello", temperature=0.0)
+        self.handler = lambda request: _completion()
+        succeeded = openai_client.generate_ai_response("Hello", temperature=0.0)
+    
+        self.assertFalse(failed["success"])
+        self.assertTrue(succeeded["success"])
+        self.assertEqual(len(self.requests), 2)
+    
+    def test_cached_results_are_copies(self):
+        openai_client.generate_ai_response("Hello", temperature=0.0)["response"] = "changed"
+    
+        self.assertEqual(openai_client.generate_ai_response("Hello", temperature=0.0)["response"], "ANSWER")
+
+
+
+class _RetryState:
+    """Just enough of tenacity's RetryCallState for _retry_wait."""
+    
+    def __init__(self, exception):
+        self.outcome = mock.Mock(exception=mock.Mock(return_value=exception))
+        self.attempt_number = 1
+
+
+class RetryTest(OpenAITestCase):
+
+    def respond(self, *responses):
+        """Answer successive requests with responses, then with a completion."""
+        queue = list(responses)
+        self.handler = lambda request: queue.pop(0) if queue else _completion()
+    
+    def test_throttled_call_is_retried_after_retry_after(self):
+        self.respond(httpx.Response(429, headers={"retry-after": "0"}, json={"error": {"message": "slow down"}}))
+    
+        result = openai_client.generate_ai_response("Hello")
+    
+        self.assertTrue(result["success"])
+        self.assertEqual(len(self.requests), 2)
+    
+    def test_gives_up_after_three_attempts(self):
+        unavailable = httpx.Response(503, headers={"retry-after": "0"}, json={"error": {"message": "busy"}})
+        self.respond(unavailable, unavailable, unavailable)
+    
+        result = openai_client.generate_ai_response("Hello")
+    
+        self.assertFalse(result["success"])
+        self.assertEqual(result["error"], "OpenAI API Error: busy")
+        self.assertEqual(len(self.requests), 3)
+    
+    def test_client_errors_are_not_retried(self):
+        self.respond(httpx.Response(400, json={"error": {"message": "bad request"}}))
+    
+        result = openai_client.generate_ai_response("Hello")
+    
+        self.assertEqual(result["error"], "OpenAI API Error: bad request")
+        self.assertEqual(len(self.requests), 1)
+    
+    def test_retry_after_is_honoured_up_to_the_cap(self):
+        def wait_for(headers):
+            return openai_client._retry_wait(_RetryState(mock.Mock(response=httpx.Response(429, headers=headers))))
+    
+        self.assertEqual(wait_for({"retry-after": "2"}), 2.0)
+        self.assertEqual(wait_for({"retry-after": "120"}), openai_client._MAX_RETRY_AFTER)
+    
+    def test_without_retry_after_backs_off_exponentially(self):
+        for exception in (mock.Mock(response=httpx.Response(429)), ConnectionError()):
+            self.assertLessEqual(openai_client._retry_wait(_RetryState(exception)), 8)
+
+
+
+class ConfigValidationTest(OpenAITestCase):
+
+    def test_missing_api_key(self):
+        with mock.patch.object(openai_client, "_CONFIG", replace(openai_client._CONFIG, api_key=None)):
+            result = openai_client.generate_ai_response("Hello")
+    
+        self.assertFalse(result["success"])
+        self.assertIn("AZURE_OPENAI_API_KEY", result["error"])
+        self.assertEqual(self.requests, [])
+    
+    def test_missing_endpoint(self):
+        with mock.patch.object(openai_client, "_CONFIG", replace(openai_client._CONFIG, endpoint=None)):
+            result = openai_client.generate_ai_response("Hello")
+    
+        self.assertIn("AZURE_OPENAI_ENDPOINT", result["error"])
+        self.assertEqual(self.requests, [])
+    
+    def test_endpoint_without_scheme_is_rejected(self):
+        result = openai_client.generate_ai_response("Hello", endpoint="myresource.openai.azure.com")
+    
+        self.assertIn("Invalid AZURE_OPENAI_ENDPOINT", result["error"])
+        self.assertEqual(self.requests, [])
+    
+    def test_stream_and_async_variants_report_the_same_error(self):
+        with self.assertRaisesRegex(ValueError, "Invalid AZURE_OPENAI_ENDPOINT"):
+            next(openai_client.generate_ai_response_stream("Hello", endpoint="not a url"))
+    
+        result = asyncio.run(openai_client.agenerate_ai_response("Hello", endpoint="not a url"))
+        self.assertIn("Invalid AZURE_OPENAI_ENDPOINT", result["error"])
+    
+    def test_failed_validation_is_not_memoized(self):
+        with mock.patch.object(openai_client, "_CONFIG", replace(openai_client._CONFIG, api_key=None)):
+            self.assertFalse(openai_client.generate_ai_response("Hello")["success"])
+    
+        self.assertTrue(openai_client.generate_ai_response("Hello")["success"])
+    
+    def test_validated_client_is_shared_until_configure(self):
+        client = openai_client._get_validated_client("test-key", "https://openai.test/")
+        self.assertIs(openai_client._get_validated_client("test-key", "https://openai.test/"), client)
+    
+        openai_client.configure(api_version="2024-10-21")
+    
+        self.assertIsNot(openai_client._get_validated_client("test-key", "https://openai.test/"), client)
+
+
+if __name__ == "__main__":
+    unittest.main()
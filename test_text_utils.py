@@ -0,0 +1,75 @@
+"""
+Tests for the chunking helpers in text_utils.py.
+
+Run with: python -m unittest test_text_utils
+"""
+import unittest
+
+from text_utils import find_split_points, split_text_chunks
+
+
+class FindSplitPointsTest(unittest.TestCase):
+
+    def test_text_that_fits_has_no_cuts(self):
+        self.assertEqual(find_split_points("x" * 10, 10), [])
+        self.assertEqual(find_split_points("", 10), [])
+    
+    def test_cuts_after_the_last_sentence_end_in_the_window(self):
+        text = "One. Two. Three four five"
+        self.assertEqual(find_split_points(text, 12), [10, 21])
+        self.assertEqual(text[:10], "One. Two. ")
+    
+    def test_sentence_end_right_at_the_window_edge_counts(self):
+        # The window is 9 characters; the space after "Two." is the 10th
+        self.assertEqual(find_split_points("One. Two. Three", 9), [10])
+    
+    def test_falls_back_to_the_last_space(self):
+        self.assertEqual(find_split_points("alpha beta gamma delta", 12), [11])
+    
+    def test_cuts_mid_word_only_without_a_space(self):
+        self.assertEqual(find_split_points("x" * 25, 10), [10, 20])
+    
+    def test_every_piece_fits(self):
+        text = "Short. " * 50 + "word " * 80 + "y" * 40
+        bounds = [0] + find_split_points(text, 30) + [len(text)]
+    
+        self.assertTrue(all(0 < b - a <= 30 for a, b in zip(bounds, bounds[1:])))
+
+
+class SplitTextChunksTest(unittest.TestCase):
+
+    def test_short_text_is_one_chunk_as_is(self):
+        self.assertEqual(split_text_chunks("  hello\n", 10), ["  hello\n"])
+    
+    def test_blank_text_has_no_chunks(self):
+        self.assertEqual(split_text_chunks("   \n  ", 10), [])
+        self.assertEqual(split_text_chunks("", 10), [])
+    
+    def test_text_of_exactly_chunk_size_is_not_split(self):
+        self.assertEqual(split_text_chunks("x" * 10, 10), ["x" * 10])
+    
+    def test_packs_paragraphs_up_to_chunk_size(self):
+        text = "aaaa\nbbbb\ncccc\ndddd"
+        self.assertEqual(split_text_chunks(text, 10), ["aaaa\nbbbb", "cccc\ndddd"])
+    
+    def test_drops_blank_paragraph_runs_between_chunks(self):
+        text = "aaaaaaaa\n\n\n\nbbbbbbbb"
+        self.assertEqual(split_text_chunks(text, 10), ["aaaaaaaa", "bbbbbbbb"])
+    
+    def test_oversized_paragraph_is_cut_at_sentence_ends(self):
+        text = "intro\n" + "First sentence. Second sentence. Third one." + "\noutro"
+        self.assertEqual(split_text_chunks(text, 20), [
+            "intro", "First sentence.", "Second sentence.", "Third one.", "outro"
+        ])
+    
+    def test_chunks_fit_and_keep_every_word(self):
+        text = "\n".join(f"Paragraph {i}. " + "Some words here. " * (i % 7) for i in range(200))
+    
+        chunks = split_text_chunks(text, 300)
+    
+        self.assertTrue(all(0 < len(chunk) <= 300 for chunk in chunks))
+        self.assertEqual(" ".join(chunks).split(), text.split())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,354 @@
+"""
+Tests for translator.py against a mocked Translator endpoint (no network).
+
+Run with: python -m unittest test_translator
+"""
+import asyncio
+import os
+import tempfile
+import unittest
+from dataclasses import replace
+from unittest import mock
+
+import httpx
+import orjson
+from cachetools import TTLCache
+
+import translator
+from translator import TranslationCache
+
+try:
+    import redis
+except ImportError:  # shared-tier tests need: pip install redis fakeredis
+    redis = None
+
+try:
+    import fakeredis
+except ImportError:
+    fakeredis = None
+
+
+def _echo_upper(request):
+    """Translator stand-in: upper-cases every text of an array request."""
+    body = orjson.loads(request.content)
+    to = request.url.params["to"]
+    return httpx.Response(200, json=[
+        {"translations": [{"text": item["text"].upper(), "to": to}], "detectedLanguage": {"language": "en"}}
+        for item in body
+    ])
+
+
+class TranslatorTestCase(unittest.TestCase):
+    """Points translator at a MockTransport; handler(request) answers every call."""
+    
+    def handler(self, request):
+        return _echo_upper(request)
+    
+    def setUp(self):
+        self.requests = []
+    
+        def record(request):
+            self.requests.append(request)
+            return self.handler(request)
+    
+        env = mock.patch.dict(os.environ)
+        env.start()
+        os.environ.pop("REDIS_URL", None)
+        self.addCleanup(env.stop)
+    
+        patches = [
+            mock.patch.object(translator, "_HTTP_CLIENT", httpx.Client(transport=httpx.MockTransport(record))),
+            mock.patch.object(translator, "_TRANSLATION_CACHE", TranslationCache()),
+            mock.patch.object(translator, "_CONFIG", replace(
+                translator._CONFIG, api_key="test-key", endpoint="https://translator.test/", trace=False
+            )),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+    
+    def request_bodies(self):
+        return [orjson.loads(request.content) for request in self.requests if request.method == "POST"]
+
+
+class BatchLimitsTest(TranslatorTestCase):
+
+    def test_groups_at_most_max_batch_items(self):
+        batches = translator._group_into_batches(["x"] * 250)
+        self.assertEqual([len(batch) for batch in batches], [100, 100, 50])
+    
+    def test_groups_at_most_max_batch_chars(self):
+        batches = translator._group_into_batches(["x" * 20000] * 5)
+        self.assertEqual([len(batch) for batch in batches], [2, 2, 1])
+    
+    def test_batch_of_exactly_the_char_limit_is_one_request(self):
+        batches = translator._group_into_batches(["x" * 25000, "y" * 25000, "z"])
+        self.assertEqual([len(batch) for batch in batches], [2, 1])
+    
+    def test_oversized_text_gets_its_own_batch(self):
+        batches = translator._group_into_batches(["a", "x" * 60000, "b"])
+        self.assertEqual(batches, [["a"], ["x" * 60000], ["b"]])
+    
+    def test_translate_texts_sends_requests_within_limits_and_keeps_order(self):
+        texts = [f"text {i}" for i in range(150)] + ["y" * 30000, "z" * 30000]
+    
+        results = translator.translate_texts(texts, "en", "fr")
+    
+        bodies = self.request_bodies()
+        self.assertEqual(len(bodies), 3)
+        for body in bodies:
+            self.assertLessEqual(len(body), translator.MAX_BATCH_ITEMS)
+            self.assertLessEqual(sum(len(item["text"]) for item in body), translator.MAX_BATCH_CHARS)
+        self.assertEqual([result["translated_text"] for result in results], [text.upper() for text in texts])
+    
+    def test_prepare_batch_sends_only_uncached_texts(self):
+        translator.translate_texts(["one", "two"], "en", "fr")
+    
+        done, request = translator._prepare_batch(["two", "three", "one"], "en", "fr", None, None, None)
+    
+        self.assertIsNone(done)
+        keys, cached, missing, url, params, headers, body = request
+        self.assertEqual(missing, [1])
+        self.assertEqual(body, [{"text": "three"}])
+        self.assertEqual(params, {"api-version": "3.0", "to": "fr", "from": "en"})
+    
+    def test_prepare_batch_without_api_key_fails_without_a_request(self):
+        with mock.patch.object(translator, "_CONFIG", replace(translator._CONFIG, api_key=None)):
+            done, request = translator._prepare_batch(["one"], "en", "fr", None, None, None)
+    
+        self.assertIsNone(request)
+        self.assertFalse(done["success"])
+        self.assertIn("AZURE_TRANSLATOR_KEY", done["error"])
+        self.assertEqual(self.requests, [])
+
+
+
+class RetryTest(TranslatorTestCase):
+
+    def respond(self, *responses):
+        """Answer successive requests with responses, then translate normally."""
+        queue = list(responses)
+        self.handler = lambda request: queue.pop(0) if queue else _echo_upper(request)
+    
+    def test_throttled_request_is_retried_after_retry_after(self):
+        self.respond(httpx.Response(429, headers={"Retry-After": "0"}))
+    
+        result = translator.translate_text("hello", "en", "fr")
+    
+        self.assertEqual(result["translated_text"], "HELLO")
+        self.assertEqual(len(self.requests), 2)
+    
+    def test_gives_up_after_retry_attempts_with_the_last_status(self):
+        self.respond(*[httpx.Response(503, headers={"Retry-After": "0"})] * translator.RETRY_ATTEMPTS)
+    
+        result = translator.translate_text("hello", "en", "fr")
+    
+        self.assertFalse(result["success"])
+        self.assertEqual(result["error"], "HTTP Error: 503")
+        self.assertEqual(len(self.requests), translator.RETRY_ATTEMPTS)
+    
+    def test_client_errors_are_not_retried(self):
+        self.respond(httpx.Response(400, json={"error": {"code": 400036, "message": "The target language is not valid."}}))
+    
+        result = translator.translate_text("hello", "en", "xx")
+    
+        self.assertEqual(result["error"], "HTTP Error: 400 - The target language is not valid.")
+        self.assertEqual(len(self.requests), 1)
+    
+    def test_retry_after_is_honoured_up_to_the_cap(self):
+        def wait_for(headers):
+            state = mock.Mock(attempt_number=1)
+            state.outcome.result.return_value = httpx.Response(429, headers=headers)
+            return translator._retry_wait(state)
+    
+        self.assertEqual(wait_for({"Retry-After": "3"}), 3.0)
+        self.assertEqual(wait_for({"Retry-After": "600"}), 30.0)
+        self.assertLessEqual(wait_for({}), 8)
+
+
+
+class LanguagesCacheTest(TranslatorTestCase):
+
+    LANGUAGES = {"translation": {"fr": {"name": "French"}, "hi": {"name": "Hindi"}}}
+    
+    def handler(self, request):
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, headers={"ETag": '"v1"'}, json=self.LANGUAGES)
+    
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        for patch in (
+            mock.patch.object(translator, "LANGUAGES_CACHE_FILE", os.path.join(directory.name, "languages.json")),
+            mock.patch.object(translator, "_LANGUAGES_CACHE", TTLCache(maxsize=1, ttl=60)),
+        ):
+            patch.start()
+            self.addCleanup(patch.stop)
+    
+    def restart(self):
+        """Forget the in-memory copy, as a new process would."""
+        translator._LANGUAGES_CACHE.clear()
+    
+    def test_list_is_fetched_once_and_stored_with_its_etag(self):
+        first = translator.get_supported_languages()
+        second = translator.get_supported_languages()
+    
+        self.assertEqual(first, {"success": True, "languages": self.LANGUAGES["translation"]})
+        self.assertEqual(second, first)
+        self.assertEqual(len(self.requests), 1)
+        self.assertEqual(translator._read_languages_file()["etag"], '"v1"')
+    
+    def test_restart_revalidates_with_if_none_match(self):
+        translator.get_supported_languages()
+        self.restart()
+    
+        result = translator.get_supported_languages()
+    
+        self.assertEqual(self.requests[-1].headers["If-None-Match"], '"v1"')
+        self.assertEqual(result["languages"], self.LANGUAGES["translation"])
+    
+    def test_changed_list_replaces_the_stored_copy(self):
+        translator.get_supported_languages()
+        self.restart()
+        self.handler = lambda request: httpx.Response(200, headers={"ETag": '"v2"'}, json={"translation": {"de": {"name": "German"}}})
+    
+        result = translator.get_supported_languages()
+    
+        self.assertEqual(result["languages"], {"de": {"name": "German"}})
+        self.assertEqual(translator._read_languages_file()["etag"], '"v2"')
+    
+    def test_outage_falls_back_to_the_stored_copy_without_caching_it(self):
+        translator.get_supported_languages()
+        self.restart()
+        self.handler = lambda request: httpx.Response(404)
+    
+        self.assertEqual(translator.get_supported_languages()["languages"], self.LANGUAGES["translation"])
+        self.assertEqual(translator.get_supported_languages()["languages"], self.LANGUAGES["translation"])
+        self.assertEqual(len(self.requests), 3)
+    
+    def test_outage_without_a_stored_copy_fails(self):
+        self.handler = lambda request: httpx.Response(404)
+    
+        result = translator.get_supported_languages()
+    
+        self.assertFalse(result["success"])
+        self.assertEqual(result["languages"], {})
+    
+    def test_configure_drops_the_in_memory_copy(self):
+        translator.get_supported_languages()
+        translator.configure(endpoint="https://other-translator.test/")
+    
+        translator.get_supported_languages()
+    
+        self.assertEqual(self.requests[-1].url.host, "other-translator.test")
+
+
+
+class TranslationCacheTest(TranslatorTestCase):
+
+    VALUE = {"translated_text": "BONJOUR", "detected_language": "en"}
+    
+    def test_key_covers_text_and_language_pair(self):
+        key = TranslationCache.key("hello", "en", "fr")
+    
+        self.assertEqual(key, TranslationCache.key("hello", "en", "fr"))
+        self.assertNotEqual(key, TranslationCache.key("hello!", "en", "fr"))
+        self.assertNotEqual(key, TranslationCache.key("hello", "auto", "fr"))
+        self.assertNotEqual(key, TranslationCache.key("hello", "en", "de"))
+    
+    def test_get_many_returns_none_for_misses(self):
+        cache = TranslationCache()
+        cache.set_many({"a": self.VALUE})
+    
+        self.assertEqual(cache.get_many(["a", "b"]), [self.VALUE, None])
+    
+        cache.clear()
+        self.assertEqual(cache.get_many(["a"]), [None])
+    
+    def test_repeated_text_is_translated_once(self):
+        first = translator.translate_texts(["hello", "world"], "en", "fr")
+        second = translator.translate_texts(["world", "hello"], "en", "fr")
+    
+        self.assertEqual(len(self.requests), 1)
+        self.assertEqual([result["translated_text"] for result in second], ["WORLD", "HELLO"])
+        self.assertEqual(second[1]["detected_language"], first[0]["detected_language"])
+    
+    def test_failures_are_not_cached(self):
+        self.handler = lambda request: httpx.Response(400)
+        self.assertFalse(translator.translate_text("hello", "en", "fr")["success"])
+    
+        self.handler = _echo_upper
+        self.assertTrue(translator.translate_text("hello", "en", "fr")["success"])
+        self.assertEqual(len(self.requests), 2)
+    
+    @unittest.skipIf(fakeredis is None, "fakeredis is not installed")
+    def test_redis_tier_is_shared_between_caches(self):
+        server = fakeredis.FakeRedis()
+        os.environ["REDIS_URL"] = "redis://cache.test:6379/0"
+    
+        with mock.patch("redis.Redis.from_url", return_value=server):
+            TranslationCache().set_many({"a": self.VALUE})
+            other = TranslationCache()
+    
+            self.assertEqual(other.get_many(["a", "b"]), [self.VALUE, None])
+        self.assertGreater(server.ttl("a"), 0)
+    
+    @unittest.skipIf(redis is None, "redis is not installed")
+    def test_redis_errors_count_as_misses(self):
+        broken = mock.Mock()
+        broken.mget.side_effect = ConnectionError("down")
+        broken.pipeline.return_value.execute.side_effect = ConnectionError("down")
+        os.environ["REDIS_URL"] = "redis://cache.test:6379/0"
+    
+        with mock.patch("redis.Redis.from_url", return_value=broken):
+            cache = TranslationCache()
+            self.assertEqual(cache.get_many(["a"]), [None])
+            cache.set_many({"a": self.VALUE})
+    
+        self.assertEqual(cache.get_many(["a"]), [self.VALUE])
+
+
+
+class InvalidResponseTest(TranslatorTestCase):
+
+    def gateway_page(self, request):
+        return httpx.Response(200, text="<html>Bad gateway</html>")
+    
+    def test_non_json_body_is_reported_and_not_cached(self):
+        self.handler = self.gateway_page
+        result = translator.translate_text("hello", "en", "fr")
+    
+        self.assertFalse(result["success"])
+        self.assertTrue(result["error"].startswith("Invalid response from Translator API"))
+    
+        self.handler = _echo_upper
+        self.assertEqual(translator.translate_text("hello", "en", "fr")["translated_text"], "HELLO")
+        self.assertEqual(len(self.requests), 2)
+    
+    def test_short_array_is_reported(self):
+        self.handler = lambda request: httpx.Response(200, json=[])
+    
+        result = translator.translate_texts(["one", "two"], "en", "fr")
+    
+        self.assertEqual([r["error"] for r in result], ["Empty or incomplete response from Translator API"] * 2)
+    
+    def test_async_path_reports_the_same_error(self):
+        client = httpx.AsyncClient(transport=httpx.MockTransport(self.gateway_page))
+    
+        async def translate():
+            try:
+                return await translator.atranslate_batch(["hello"], "en", "fr")
+            finally:
+                await client.aclose()
+    
+        with mock.patch.object(translator, "get_async_client", return_value=client):
+            result = asyncio.run(translate())
+    
+        self.assertFalse(result["success"])
+        self.assertTrue(result["error"].startswith("Invalid response from Translator API"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+"""
+Text Utilities Module
+
+Helpers shared by the translator and OpenAI modules for splitting long
+documents into request-sized pieces.
+"""
+
+import re
+from typing import List
+
+# Sentence end (. ! ?) followed by whitespace; compiled once and scanned by the C regex engine
+_SENTENCE_END_RE = re.compile(r'(?<=[.!?])\s+')
+
+
+def find_split_points(text: str, max_chunk: int) -> List[int]:
+    """
+    Find offsets that cut text into pieces of at most max_chunk characters.
+
+    Prefers the last sentence end inside each window, then the last space,
+    and only cuts mid-word when a window has neither.
+
+    Args:
+        text: The text to split
+        max_chunk: Maximum characters per piece
+
+    Returns:
+        Increasing cut offsets, excluding 0 and len(text)
+    """
+    points = []
+    start = 0
+
+    while len(text) - start > max_chunk:
+        limit = start + max_chunk
+        cut = 0
+
+        for match in _SENTENCE_END_RE.finditer(text, start, limit + 1):
+            cut = match.end()
+
+        if cut <= start:
+            cut = text.rfind(' ', start, limit) + 1
+        if cut <= start:
+            cut = limit
+
+        points.append(cut)
+        start = cut
+
+    return points
+
+
+def split_text_chunks(text: str, chunk_size: int = 5000) -> List[str]:
+    """
+    Split text into chunks at paragraph (line) boundaries.
+
+    Args:
+        text: The text to split
+        chunk_size: Maximum characters per chunk
+
+    Returns:
+        List of non-empty chunks, in document order
+    """
+    if len(text) <= chunk_size:
+        return [text] if text.strip() else []
+
+    paragraphs = text.split('\n')
+    chunks = []
+    current_chunk = ""
+
+    for para in paragraphs:
+        # A paragraph that alone exceeds the chunk size is cut at sentence ends
+        if len(para) > chunk_size:
+            if current_chunk.strip():
+                chunks.append(current_chunk.strip())
+            bounds = [0] + find_split_points(para, chunk_size) + [len(para)]
+            pieces = [para[a:b].strip() for a, b in zip(bounds, bounds[1:])]
+            chunks.extend(piece for piece in pieces if piece)
+            current_chunk = ""
+            continue
+
+        # If adding this paragraph would exceed chunk size, save current chunk
+        if len(current_chunk) + len(para) + 1 > chunk_size and current_chunk:
+            if current_chunk.strip():
+                chunks.append(current_chunk.strip())
+            current_chunk = para + "\n"
+        else:
+            current_chunk += para + "\n"
+
+    # Don't forget the last chunk
+    if current_chunk.strip():
+        chunks.append(current_chunk.strip())
+
+    return chunks
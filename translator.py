@@ -9,14 +9,289 @@ Region: Central India
 """
 
 import os
-import requests
+import sys
+import asyncio
+import hashlib
+import httpx
+import orjson
+import threading
 import uuid
+import weakref
+from dataclasses import dataclass, replace
+from concurrent.futures import ThreadPoolExecutor
+from cachetools import TTLCache
 from dotenv import load_dotenv
-from typing import Optional
+from tenacity import retry, retry_if_result, stop_after_attempt, wait_random_exponential
+from typing import List, Optional
+
+from text_utils import split_text_chunks
 
 # Load environment variables
 load_dotenv()
 
+# Maximum number of chunk requests in flight at once for a single document
+MAX_CONCURRENT_REQUESTS = 8
+
+# Translator array API limits per request
+MAX_BATCH_ITEMS = 100
+MAX_BATCH_CHARS = 50000
+
+# How long cached translations live (see TranslationCache)
+TRANSLATION_CACHE_TTL = 24 * 60 * 60
+
+
+@dataclass(frozen=True, slots=True)
+class _TranslatorConfig:
+    """Azure Translator settings, read from the environment once at import (see configure)."""
+    api_key: Optional[str]
+    region: str
+    endpoint: str
+    # Send an X-ClientTraceId with each request (optional; useful when raising support tickets)
+    trace: bool
+    
+    @classmethod
+    def from_env(cls) -> "_TranslatorConfig":
+        return cls(
+            api_key=os.environ.get("AZURE_TRANSLATOR_KEY"),
+            region=os.environ.get("AZURE_TRANSLATOR_REGION", "centralindia"),
+            endpoint=os.environ.get("AZURE_TRANSLATOR_ENDPOINT", "https://api.cognitive.microsofttranslator.com/"),
+            trace=bool(os.environ.get("AZURE_TRANSLATOR_TRACE"))
+        )
+
+
+_CONFIG = _TranslatorConfig.from_env()
+
+# Responses worth retrying: throttling and transient server errors
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+RETRY_ATTEMPTS = 4
+
+_HTTP_CLIENT: Optional[httpx.Client] = None
+_HTTP_CLIENT_LOCK = threading.Lock()
+
+# Async HTTP/2 clients, one per event loop
+_ASYNC_CLIENTS: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+# Supported-languages list: in memory for a day, on disk with its ETag across restarts
+LANGUAGES_CACHE_TTL = 24 * 60 * 60
+LANGUAGES_CACHE_FILE = os.path.join(
+    os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+    "transalor",
+    "languages.json"
+)
+_LANGUAGES_CACHE = TTLCache(maxsize=1, ttl=LANGUAGES_CACHE_TTL)
+_LANGUAGES_LOCK = threading.Lock()
+
+
+def configure(**settings) -> None:
+    """
+    Override Azure Translator settings read from the environment at import.
+    
+    Args:
+        **settings: Any of api_key, region, endpoint, trace
+    
+    Example:
+        >>> configure(region="westeurope")
+    """
+    global _CONFIG
+    
+    with _LANGUAGES_LOCK:
+        _CONFIG = replace(_CONFIG, **settings)
+        # The languages list belongs to the previous endpoint
+        _LANGUAGES_CACHE.clear()
+
+
+def get_http_client() -> httpx.Client:
+    """
+    Return the shared HTTP/2 client used for all sync Translator calls.
+    
+    Concurrent requests (e.g. translate_texts' thread pool) multiplex over
+    one keep-alive HTTP/2 connection instead of opening a TCP+TLS connection
+    each. It is created lazily so that each gunicorn worker builds its own
+    connection pool after fork. Throttled and 5xx responses are retried by
+    _send_request, not here.
+    """
+    global _HTTP_CLIENT
+    
+    if _HTTP_CLIENT is None:
+        with _HTTP_CLIENT_LOCK:
+            if _HTTP_CLIENT is None:
+                limits = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+                _HTTP_CLIENT = httpx.Client(
+                    timeout=httpx.Timeout(30.0, connect=5.0),
+                    # retries= re-attempts failed connections only
+                    transport=httpx.HTTPTransport(http2=True, limits=limits, retries=2)
+                )
+    
+    return _HTTP_CLIENT
+
+
+def _retry_wait(retry_state) -> float:
+    """Wait as long as a throttled response's Retry-After asks (capped), else back off exponentially."""
+    response = retry_state.outcome.result()
+    try:
+        return min(float(response.headers["Retry-After"]), 30.0)
+    except (KeyError, ValueError):
+        return wait_random_exponential(multiplier=0.5, max=8)(retry_state)
+
+
+# Retry throttled / 5xx responses; once attempts run out the last response is
+# returned (for raise_for_status), and transport errors propagate as-is
+_with_retries = retry(
+    retry=retry_if_result(lambda response: response.status_code in RETRY_STATUSES),
+    wait=_retry_wait,
+    stop=stop_after_attempt(RETRY_ATTEMPTS),
+    retry_error_callback=lambda retry_state: retry_state.outcome.result()
+)
+
+
+@_with_retries
+def _send_request(method: str, url: str, **kwargs) -> httpx.Response:
+    """Send a request on the shared client, retrying throttled and 5xx responses."""
+    return get_http_client().request(method, url, **kwargs)
+
+
+@_with_retries
+async def _asend_request(method: str, url: str, **kwargs) -> httpx.Response:
+    """Async _send_request, on the running loop's client."""
+    return await get_async_client().request(method, url, **kwargs)
+
+
+class TranslationCache:
+    """
+    Cache of translations keyed by (text, source, target).
+    
+    Translator output is deterministic for a given triple, so repeated
+    strings skip both the round-trip and the per-character cost. Two tiers:
+    an in-process TTL/LRU cache, backed by Redis (shared across workers and
+    restarts) when REDIS_URL is set and redis is installed. Thread-safe;
+    Redis errors count as misses.
+    
+    Values are {"translated_text", "detected_language"} dicts.
+    """
+    
+    def __init__(self, maxsize: int = 10_000, ttl: int = TRANSLATION_CACHE_TTL):
+        self.ttl = ttl
+        self._local = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+        self._redis_client = None
+        self._redis_checked = False
+    
+    @staticmethod
+    def key(text: str, source_lang: str, target_lang: str) -> str:
+        """Cache key: language pair plus a BLAKE2b digest of the text."""
+        digest = hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+        return f"translation:{source_lang}:{target_lang}:{digest}"
+    
+    def _redis(self):
+        """Redis client for the shared tier, or None when not configured."""
+        if not self._redis_checked:
+            with self._lock:
+                if not self._redis_checked:
+                    url = os.getenv("REDIS_URL")
+                    if url:
+                        try:
+                            import redis
+                            self._redis_client = redis.Redis.from_url(url, socket_timeout=1)
+                        except ImportError:
+                            print("DEBUG: REDIS_URL set but redis is not installed; using in-process cache only", file=sys.stderr)
+                    self._redis_checked = True
+        
+        return self._redis_client
+    
+    def get_many(self, keys: List[str]) -> List[Optional[dict]]:
+        """Look up cached translations, returning None for each miss."""
+        with self._lock:
+            values = [self._local.get(key) for key in keys]
+        
+        missing = [i for i, value in enumerate(values) if value is None]
+        client = self._redis()
+        
+        if missing and client is not None:
+            try:
+                raw_values = client.mget([keys[i] for i in missing])
+            except Exception as e:
+                print(f"DEBUG: Redis cache lookup failed: {str(e)}", file=sys.stderr)
+                return values
+            
+            with self._lock:
+                for i, raw in zip(missing, raw_values):
+                    if raw:
+                        values[i] = self._local[keys[i]] = orjson.loads(raw)
+        
+        return values
+    
+    def set_many(self, items: dict) -> None:
+        """Store {key: value} in both tiers."""
+        with self._lock:
+            self._local.update(items)
+        
+        client = self._redis()
+        
+        if client is not None:
+            try:
+                pipe = client.pipeline(transaction=False)
+                for key, value in items.items():
+                    pipe.set(key, orjson.dumps(value), ex=self.ttl)
+                pipe.execute()
+            except Exception as e:
+                print(f"DEBUG: Redis cache store failed: {str(e)}", file=sys.stderr)
+    
+    def clear(self) -> None:
+        """Empty the in-process tier (Redis entries expire on their own)."""
+        with self._lock:
+            self._local.clear()
+
+
+_TRANSLATION_CACHE = TranslationCache()
+
+
+def _build_translate_request(
+    source_lang: str,
+    target_lang: str,
+    api_key: str,
+    region: str,
+    endpoint: str
+) -> tuple:
+    """Return (url, params, headers) for a Translator /translate call."""
+    # Build the API URL
+    path = "/translate"
+    api_version = "3.0"
+    url = f"{endpoint.rstrip('/')}{path}"
+    
+    # Query parameters - omit 'from' to enable auto-detection
+    params = {
+        "api-version": api_version,
+        "to": target_lang
+    }
+    
+    # Only include source language if explicitly specified (not auto-detect)
+    if source_lang and source_lang.lower() not in ['auto', 'auto-detect', '']:
+        params["from"] = source_lang
+    
+    # Request headers
+    headers = {
+        "Ocp-Apim-Subscription-Key": api_key,
+        "Ocp-Apim-Subscription-Region": region,
+        "Content-Type": "application/json"
+    }
+    
+    if _CONFIG.trace:
+        headers["X-ClientTraceId"] = str(uuid.uuid4())
+    
+    return url, params, headers
+
+
+def _http_error_message(e: httpx.HTTPStatusError) -> str:
+    """Build an error message from a Translator HTTP error response."""
+    error_msg = f"HTTP Error: {e.response.status_code}"
+    try:
+        error_detail = orjson.loads(e.response.content)
+        if "error" in error_detail:
+            error_msg = f"{error_msg} - {error_detail['error'].get('message', '')}"
+    except:
+        pass
+    return error_msg
+
 
 def translate_text(
     text: str,
@@ -50,107 +325,370 @@ def translate_text(
         >>> result = translate_text("Hello, world!", "en", "hi")
         >>> print(result['translated_text'])
     """
+    return translate_texts([text], source_lang, target_lang, api_key, region, endpoint)[0]
+
+
+def translate_texts(
+    texts: List[str],
+    source_lang: str,
+    target_lang: str,
+    api_key: Optional[str] = None,
+    region: Optional[str] = None,
+    endpoint: Optional[str] = None
+) -> List[dict]:
+    """
+    Translate many texts with as few Translator requests as possible.
+    
+    Texts are packed, in order, into array requests within the
+    MAX_BATCH_ITEMS / MAX_BATCH_CHARS limits (see translate_batch) and the
+    requests are sent concurrently. A failed request only fails the texts
+    it carried.
+    
+    Args:
+        texts: The texts to translate; each must fit in one request
+            (use translate_long_text for longer documents)
+        source_lang: Source language code (use 'auto' for auto-detection)
+        target_lang: Target language code
+        api_key: Optional API key (defaults to env variable)
+        region: Optional region (defaults to env variable)
+        endpoint: Optional endpoint (defaults to env variable)
+    
+    Returns:
+        List of translate_text result dicts, one per text in input order
+    """
+    if not texts:
+        return []
+    
+    batches = _group_into_batches(texts)
+    
+    def run(batch):
+        return translate_batch(batch, source_lang, target_lang, api_key, region, endpoint)
+    
+    if len(batches) == 1:
+        results = [run(batches[0])]
+    else:
+        # map() keeps results in input order
+        with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENT_REQUESTS, len(batches))) as pool:
+            results = list(pool.map(run, batches))
+    
+    return _per_text_results(batches, results, source_lang, target_lang)
+
+
+def _per_text_results(batches: List[List[str]], results: List[dict], source_lang: str, target_lang: str) -> List[dict]:
+    """Expand batch results into one translate_text-style dict per text."""
+    translations = []
+    
+    for batch, result in zip(batches, results):
+        for i, text in enumerate(batch):
+            if result["success"]:
+                translations.append({
+                    "success": True,
+                    "original_text": text,
+                    "translated_text": result["translated_texts"][i],
+                    "source_language": source_lang,
+                    "target_language": target_lang,
+                    "detected_language": result["detected_languages"][i],
+                    "error": None
+                })
+            else:
+                translations.append({
+                    "success": False,
+                    "error": result["error"],
+                    "original_text": text,
+                    "translated_text": None,
+                    "source_language": source_lang,
+                    "target_language": target_lang
+                })
+    
+    return translations
+
+
+def _batch_failure(error: str, source_lang: str, target_lang: str) -> dict:
+    """Failure result for translate_batch / atranslate_batch."""
+    return {
+        "success": False,
+        "error": error,
+        "translated_texts": None,
+        "source_language": source_lang,
+        "target_language": target_lang
+    }
+
+
+def _batch_success(cached: List[dict], source_lang: str, target_lang: str) -> dict:
+    """Success result for translate_batch / atranslate_batch from per-text entries."""
+    return {
+        "success": True,
+        "translated_texts": [value["translated_text"] for value in cached],
+        "source_language": source_lang,
+        "target_language": target_lang,
+        "detected_languages": [value["detected_language"] for value in cached],
+        "detected_language": cached[0]["detected_language"] if cached else None,
+        "error": None
+    }
+
+
+def _prepare_batch(texts, source_lang, target_lang, api_key, region, endpoint):
+    """
+    Cache lookup and request building shared by the sync and async batch calls.
+    
+    Returns:
+        (result, None) when no request is needed (everything cached, or
+        misconfigured), else (None, (keys, cached, missing, url, params, headers, body))
+    """
+    # Serve already-translated texts from cache; only the misses are sent
+    keys = [TranslationCache.key(text, source_lang, target_lang) for text in texts]
+    cached = _TRANSLATION_CACHE.get_many(keys)
+    missing = [i for i, value in enumerate(cached) if value is None]
+    
+    if not missing:
+        return _batch_success(cached, source_lang, target_lang), None
     
     # Get configuration from environment or parameters
-    api_key = api_key or os.getenv("AZURE_TRANSLATOR_KEY")
-    region = region or os.getenv("AZURE_TRANSLATOR_REGION", "centralindia")
-    endpoint = endpoint or os.getenv("AZURE_TRANSLATOR_ENDPOINT", "https://api.cognitive.microsofttranslator.com/")
+    api_key = api_key or _CONFIG.api_key
+    region = region or _CONFIG.region
+    endpoint = endpoint or _CONFIG.endpoint
     
     # Validate configuration
     if not api_key:
-        return {
-            "success": False,
-            "error": "Missing AZURE_TRANSLATOR_KEY. Please set it in .env file.",
-            "original_text": text,
-            "translated_text": None,
-            "source_language": source_lang,
-            "target_language": target_lang
+        return _batch_failure("Missing AZURE_TRANSLATOR_KEY. Please set it in .env file.", source_lang, target_lang), None
+    
+    url, params, headers = _build_translate_request(source_lang, target_lang, api_key, region, endpoint)
+    body = [{"text": texts[i]} for i in missing]
+    
+    return None, (keys, cached, missing, url, params, headers, body)
+
+
+def _finish_batch(result, keys, cached, missing, source_lang, target_lang) -> dict:
+    """Merge a Translator array response into the cached entries and cache it."""
+    if not result or len(result) != len(missing):
+        return _batch_failure("Empty or incomplete response from Translator API", source_lang, target_lang)
+    
+    fresh = {}
+    for i, item in zip(missing, result):
+        cached[i] = fresh[keys[i]] = {
+            "translated_text": item["translations"][0]["text"],
+            "detected_language": item.get("detectedLanguage", {}).get("language")
         }
+    _TRANSLATION_CACHE.set_many(fresh)
     
-    # Build the API URL
-    path = "/translate"
-    api_version = "3.0"
-    url = f"{endpoint.rstrip('/')}{path}"
+    return _batch_success(cached, source_lang, target_lang)
+
+
+def translate_batch(
+    texts: List[str],
+    source_lang: str,
+    target_lang: str,
+    api_key: Optional[str] = None,
+    region: Optional[str] = None,
+    endpoint: Optional[str] = None
+) -> dict:
+    """
+    Translate several texts in a single Translator request (array API).
     
-    # Query parameters - omit 'from' to enable auto-detection
-    params = {
-        "api-version": api_version,
-        "to": target_lang
-    }
+    One request carries at most MAX_BATCH_ITEMS texts totalling
+    MAX_BATCH_CHARS characters; callers are responsible for staying
+    under these limits (translate_texts groups texts accordingly).
     
-    # Only include source language if explicitly specified (not auto-detect)
-    if source_lang and source_lang.lower() not in ['auto', 'auto-detect', '']:
-        params["from"] = source_lang
+    Args:
+        texts: The texts to translate
+        source_lang: Source language code (use 'auto' for auto-detection)
+        target_lang: Target language code
+        api_key: Optional API key (defaults to env variable)
+        region: Optional region (defaults to env variable)
+        endpoint: Optional endpoint (defaults to env variable)
     
-    # Request headers
-    headers = {
-        "Ocp-Apim-Subscription-Key": api_key,
-        "Ocp-Apim-Subscription-Region": region,
-        "Content-Type": "application/json",
-        "X-ClientTraceId": str(uuid.uuid4())
-    }
+    Returns:
+        dict containing:
+            - success: bool indicating if translation succeeded
+            - translated_texts: list of translations in input order (if successful)
+            - detected_languages: detected language of each text
+            - detected_language: detected language of the first text
+            - source_language: specified source language
+            - target_language: target language
+            - error: error message (if failed)
+    """
+    done, request = _prepare_batch(texts, source_lang, target_lang, api_key, region, endpoint)
     
-    # Request body
-    body = [{"text": text}]
+    if done is not None:
+        return done
+    
+    keys, cached, missing, url, params, headers, body = request
     
     try:
-        # Make the API request
-        response = requests.post(url, params=params, headers=headers, json=body, timeout=30)
+        response = _send_request("POST", url, params=params, headers=headers, content=orjson.dumps(body))
         response.raise_for_status()
         
-        # Parse response
-        result = response.json()
-        
-        if result and len(result) > 0:
-            translation = result[0]
-            translated_text = translation["translations"][0]["text"]
-            
-            return {
-                "success": True,
-                "original_text": text,
-                "translated_text": translated_text,
-                "source_language": source_lang,
-                "target_language": target_lang,
-                "detected_language": translation.get("detectedLanguage", {}).get("language"),
-                "error": None
-            }
-        else:
-            return {
-                "success": False,
-                "error": "Empty response from Translator API",
-                "original_text": text,
-                "translated_text": None,
-                "source_language": source_lang,
-                "target_language": target_lang
-            }
-            
-    except requests.exceptions.HTTPError as e:
-        error_msg = f"HTTP Error: {e.response.status_code}"
+        return _finish_batch(orjson.loads(response.content), keys, cached, missing, source_lang, target_lang)
+    
+    except httpx.HTTPStatusError as e:
+        return _batch_failure(_http_error_message(e), source_lang, target_lang)
+    
+    except httpx.HTTPError as e:
+        return _batch_failure(f"Request failed: {str(e)}", source_lang, target_lang)
+    
+    except ValueError as e:
+        # Non-JSON body on a 2xx, e.g. an HTML page from a proxy or gateway
+        return _batch_failure(f"Invalid response from Translator API: {str(e)}", source_lang, target_lang)
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """
+    Return the HTTP/2 client for async Translator calls on the running loop.
+    
+    Async connection pools belong to the event loop that opened them, so
+    one client is kept per loop; concurrent requests multiplex over a
+    single HTTP/2 connection. Must be called from inside a coroutine, and
+    closed with close_async_client() before the loop ends.
+    """
+    loop = asyncio.get_running_loop()
+    
+    with _HTTP_CLIENT_LOCK:
+        client = _ASYNC_CLIENTS.get(loop)
+        if client is None:
+            limits = httpx.Limits(max_connections=50, max_keepalive_connections=20)
+            client = _ASYNC_CLIENTS[loop] = httpx.AsyncClient(
+                timeout=30,
+                # retries= re-attempts failed connections only
+                transport=httpx.AsyncHTTPTransport(http2=True, limits=limits, retries=2)
+            )
+    
+    return client
+
+
+async def atranslate_batch(
+    texts: List[str],
+    source_lang: str,
+    target_lang: str,
+    api_key: Optional[str] = None,
+    region: Optional[str] = None,
+    endpoint: Optional[str] = None
+) -> dict:
+    """Async version of translate_batch; same arguments, limits and result dict."""
+    done, request = _prepare_batch(texts, source_lang, target_lang, api_key, region, endpoint)
+    
+    if done is not None:
+        return done
+    
+    keys, cached, missing, url, params, headers, body = request
+    
+    try:
+        response = await _asend_request("POST", url, params=params, headers=headers, content=orjson.dumps(body))
+        response.raise_for_status()
+    
+        return _finish_batch(orjson.loads(response.content), keys, cached, missing, source_lang, target_lang)
+    
+    except httpx.HTTPStatusError as e:
+        return _batch_failure(_http_error_message(e), source_lang, target_lang)
+    
+    except httpx.HTTPError as e:
+        return _batch_failure(f"Request failed: {str(e)}", source_lang, target_lang)
+    
+    except ValueError as e:
+        # Non-JSON body on a 2xx, e.g. an HTML page from a proxy or gateway
+        return _batch_failure(f"Invalid response from Translator API: {str(e)}", source_lang, target_lang)
+
+
+async def atranslate_text(
+    text: str,
+    source_lang: str,
+    target_lang: str,
+    api_key: Optional[str] = None,
+    region: Optional[str] = None,
+    endpoint: Optional[str] = None
+) -> dict:
+    """Async version of translate_text; same arguments and result dict."""
+    return (await translate_many([text], source_lang, target_lang, 1, api_key, region, endpoint))[0]
+
+
+async def translate_many(
+    texts: List[str],
+    source_lang: str,
+    target_lang: str,
+    concurrency: int = 10,
+    api_key: Optional[str] = None,
+    region: Optional[str] = None,
+    endpoint: Optional[str] = None
+) -> List[dict]:
+    """
+    Async translate_texts: translate many texts concurrently.
+    
+    Texts are packed into array requests like translate_texts, with up to
+    `concurrency` requests in flight at once, so N snippets cost about one
+    round-trip rather than N.
+    
+    Returns:
+        List of translate_text result dicts, one per text in input order
+    """
+    if not texts:
+        return []
+    
+    semaphore = asyncio.Semaphore(concurrency)
+    batches = _group_into_batches(texts)
+    
+    async def run(batch):
+        async with semaphore:
+            return await atranslate_batch(batch, source_lang, target_lang, api_key, region, endpoint)
+    
+    results = await asyncio.gather(*(run(batch) for batch in batches))
+    return _per_text_results(batches, results, source_lang, target_lang)
+
+
+async def close_async_client() -> None:
+    """
+    Close the running loop's Translator client and its connections.
+    
+    Call before the event loop shuts down (translate_many_sync does);
+    a later call on the same loop opens a fresh client.
+    """
+    with _HTTP_CLIENT_LOCK:
+        client = _ASYNC_CLIENTS.pop(asyncio.get_running_loop(), None)
+    
+    if client is not None:
+        await client.aclose()
+
+
+def translate_many_sync(
+    texts: List[str],
+    source_lang: str,
+    target_lang: str,
+    concurrency: int = 10,
+    api_key: Optional[str] = None,
+    region: Optional[str] = None,
+    endpoint: Optional[str] = None
+) -> List[dict]:
+    """
+    Blocking wrapper around translate_many for synchronous callers.
+    
+    Runs its own event loop, so it must not be called from inside one.
+    """
+    async def run():
         try:
-            error_detail = e.response.json()
-            if "error" in error_detail:
-                error_msg = f"{error_msg} - {error_detail['error'].get('message', '')}"
-        except:
-            pass
-        
-        return {
-            "success": False,
-            "error": error_msg,
-            "original_text": text,
-            "translated_text": None,
-            "source_language": source_lang,
-            "target_language": target_lang
-        }
-        
-    except requests.exceptions.RequestException as e:
-        return {
-            "success": False,
-            "error": f"Request failed: {str(e)}",
-            "original_text": text,
-            "translated_text": None,
-            "source_language": source_lang,
-            "target_language": target_lang
-        }
+            return await translate_many(texts, source_lang, target_lang, concurrency, api_key, region, endpoint)
+        finally:
+            # The loop dies with asyncio.run(); close its client's connections first
+            await close_async_client()
+    
+    return asyncio.run(run())
+
+
+def _group_into_batches(texts: List[str]) -> List[List[str]]:
+    """Group texts, in order, into batches that fit the Translator array limits."""
+    batches = []
+    current = []
+    current_chars = 0
+    
+    for text in texts:
+        if current and (len(current) >= MAX_BATCH_ITEMS or current_chars + len(text) > MAX_BATCH_CHARS):
+            batches.append(current)
+            current = []
+            current_chars = 0
+        current.append(text)
+        current_chars += len(text)
+    
+    if current:
+        batches.append(current)
+    
+    return batches
 
 
 def translate_long_text(
@@ -161,7 +699,7 @@ def translate_long_text(
 ) -> dict:
     """
     Translate long text by splitting into chunks.
-    Azure Translator has a ~10,000 character limit per request.
+    Chunks are translated together with translate_texts.
     
     Args:
         text: The long text to translate
@@ -184,32 +722,14 @@ def translate_long_text(
         return translate_text(text, source_lang, target_lang)
     
     # Split text into chunks at paragraph boundaries
-    paragraphs = text.split('\n')
-    chunks = []
-    current_chunk = ""
-    
-    for para in paragraphs:
-        # If adding this paragraph would exceed chunk size, save current chunk
-        if len(current_chunk) + len(para) + 1 > chunk_size and current_chunk:
-            chunks.append(current_chunk.strip())
-            current_chunk = para + "\n"
-        else:
-            current_chunk += para + "\n"
-    
-    # Don't forget the last chunk
-    if current_chunk.strip():
-        chunks.append(current_chunk.strip())
+    chunks = split_text_chunks(text, chunk_size)
     
-    print(f"DEBUG: Translating {len(chunks)} chunks for long document...", file=__import__('sys').stderr)
+    print(f"DEBUG: Translating {len(chunks)} chunks for long document...", file=sys.stderr)
     
-    # Translate each chunk
-    translated_chunks = []
-    detected_lang = None
+    # Chunks are packed into as few concurrent array requests as possible
+    results = translate_texts(chunks, source_lang, target_lang)
     
-    for i, chunk in enumerate(chunks):
-        print(f"DEBUG: Translating chunk {i+1}/{len(chunks)} ({len(chunk)} chars)...", file=__import__('sys').stderr)
-        result = translate_text(chunk, source_lang, target_lang)
-        
+    for i, result in enumerate(results):
         if not result["success"]:
             return {
                 "success": False,
@@ -217,12 +737,11 @@ def translate_long_text(
                 "translated_text": None,
                 "chunks_completed": i
             }
-        
-        translated_chunks.append(result["translated_text"])
-        
-        # Capture detected language from first chunk
-        if i == 0 and result.get("detected_language"):
-            detected_lang = result["detected_language"]
+    
+    translated_chunks = [result["translated_text"] for result in results]
+    
+    # Capture detected language from first chunk
+    detected_lang = results[0].get("detected_language")
     
     # Combine all translated chunks
     full_translation = "\n".join(translated_chunks)
@@ -239,22 +758,71 @@ def translate_long_text(
     }
 
 
+def _read_languages_file() -> Optional[dict]:
+    """Load the on-disk {"etag", "languages"} copy, or None if absent/unreadable."""
+    try:
+        with open(LANGUAGES_CACHE_FILE, 'rb') as f:
+            stored = orjson.loads(f.read())
+        return stored if stored.get("languages") else None
+    except (OSError, ValueError):
+        return None
+
+
+def _write_languages_file(etag: str, languages: dict) -> None:
+    """Persist the language list with its ETag; best effort (read-only disks are fine)."""
+    try:
+        os.makedirs(os.path.dirname(LANGUAGES_CACHE_FILE), exist_ok=True)
+        tmp_path = f"{LANGUAGES_CACHE_FILE}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(orjson.dumps({"etag": etag, "languages": languages}))
+        os.replace(tmp_path, LANGUAGES_CACHE_FILE)
+    except OSError as e:
+        print(f"DEBUG: Could not write languages cache: {str(e)}", file=sys.stderr)
+
+
 def get_supported_languages() -> dict:
     """
     Get list of supported languages from Azure Translator.
     
+    The list changes rarely: it is kept in memory for LANGUAGES_CACHE_TTL,
+    and persisted with its ETag so that a restarted process revalidates
+    with If-None-Match (304, no body) instead of downloading it again.
+    
     Returns:
         dict containing supported languages for translation
     """
-    endpoint = os.getenv("AZURE_TRANSLATOR_ENDPOINT", "https://api.cognitive.microsofttranslator.com/")
-    url = f"{endpoint.rstrip('/')}/languages?api-version=3.0&scope=translation"
+    with _LANGUAGES_LOCK:
+        languages = _LANGUAGES_CACHE.get("translation")
+    
+    if languages is not None:
+        return {"success": True, "languages": languages}
+    
+    url = f"{_CONFIG.endpoint.rstrip('/')}/languages?api-version=3.0&scope=translation"
+    
+    stored = _read_languages_file()
+    headers = {"If-None-Match": stored["etag"]} if stored and stored.get("etag") else {}
     
     try:
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()
-        return {"success": True, "languages": response.json().get("translation", {})}
+        response = _send_request("GET", url, headers=headers)
+        
+        if response.status_code == 304 and stored:
+            languages = stored["languages"]
+        else:
+            response.raise_for_status()
+            languages = orjson.loads(response.content).get("translation", {})
+            if response.headers.get("ETag"):
+                _write_languages_file(response.headers["ETag"], languages)
     except Exception as e:
-        return {"success": False, "error": str(e), "languages": {}}
+        if not stored:
+            return {"success": False, "error": str(e), "languages": {}}
+        # Service unreachable: a stale list beats none (not cached, so retried next call)
+        print(f"DEBUG: Languages fetch failed, using stored copy: {str(e)}", file=sys.stderr)
+        return {"success": True, "languages": stored["languages"]}
+    
+    with _LANGUAGES_LOCK:
+        _LANGUAGES_CACHE["translation"] = languages
+    
+    return {"success": True, "languages": languages}
 
 
 # Quick test when run directly
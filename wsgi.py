@@ -0,0 +1,17 @@
+"""
+WSGI Entry Point for Production
+
+Run with gevent workers so that outbound Azure Translator / Azure OpenAI
+calls yield the worker while waiting on the network:
+
+    gunicorn -k gevent -w 4 --worker-connections 500 --preload wsgi:app
+
+Routes stay synchronous Flask views; gevent makes the blocking socket
+calls cooperative, so one worker can serve many uploads at once.
+"""
+
+# Must run before anything imports socket/ssl/threading (requests, openai, etc.)
+from gevent import monkey
+monkey.patch_all()
+
+from app import app  # noqa: E402